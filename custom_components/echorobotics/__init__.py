@@ -3,22 +3,24 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Iterable
+from datetime import timedelta
 import logging
 import random
+from typing import Any
 
 import aiohttp
-import async_timeout
 import echoroboticsapi
 import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
-from homeassistant.helpers.typing import UNDEFINED
+from homeassistant.helpers.typing import UNDEFINED, ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers import device_registry, entity_registry
+import homeassistant.helpers.config_validation as cv
 
 from .const import (
     DOMAIN,
@@ -28,7 +30,26 @@ from .const import (
     HISTORY_UPDATE_INTERVAL,
     UNAVAILABLE_TIMEOUT,
     UNAVAILABLE_FETCHES,
+    EVENT_STUCK,
+    EVENT_ALARM,
+    ALARM_POLL_INTERVAL,
+    ALARM_POLL_MAX_DURATION,
+    TASK_GROUP_MAX_CONCURRENCY,
+    TASK_SHUTDOWN_DEADLINE,
 )
+from .api import EchoRoboticsApi, async_create_api, async_remove_budget
+from .budget import budget_timeout
+from .config_fingerprint import ConfigFingerprint
+from .fleet import FleetAggregate, async_get_fleet, async_remove_fleet
+from .metrics import EchoRoboticsMetricsView
+from .mode_timeline import ModeTimeline, MODE_SOURCE_OBSERVED
+from .poll_scheduler import async_get_poll_scheduler
+from .profiler import IntegrationProfiler
+from .status_table import StatusRecord, status_record
+from .stuck import StuckDetector
+from .task_group import CoordinatorTaskGroup, async_get_task_stats
+from .telemetry import TelemetryHistory
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,33 +59,53 @@ PLATFORMS: list[Platform] = [
     Platform.DEVICE_TRACKER,
     Platform.SWITCH,
     Platform.LAWN_MOWER,
+    Platform.BINARY_SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the echorobotics services and metrics view."""
+    async_setup_services(hass)
+    hass.http.register_view(EchoRoboticsMetricsView(hass))
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up echorobotics from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
 
-    api = echoroboticsapi.Api(
-        websession=async_create_clientsession(
-            hass,
-            cookies=echoroboticsapi.create_cookies(
-                user_id=entry.data["user_id"], user_token=entry.data["user_token"]
-            ),
-        ),
+    api = async_create_api(
+        hass,
+        user_id=entry.data["user_id"],
+        user_token=entry.data["user_token"],
         robot_ids=[entry.data["robot_id"]],
     )
     smartmode = echoroboticsapi.SmartMode(entry.data["robot_id"])
     api.register_smart_mode(smartmode)
+    mode_timeline = ModeTimeline(hass, entry.entry_id, entry.data["robot_id"])
+    await mode_timeline.async_load()
+    mode_timeline.seed_smart_mode(smartmode)
+    config_fingerprint = ConfigFingerprint(hass, entry.entry_id, entry.data["robot_id"])
+    await config_fingerprint.async_load()
     smartfetch = echoroboticsapi.SmartFetch(
         api, fetch_history_wait_time=HISTORY_UPDATE_INTERVAL
     )
     # missing: validate api connection
 
-    coordinator = EchoRoboticsDataUpdateCoordinator(hass, api, smartmode, smartfetch)
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    fleet = async_get_fleet(hass, entry.data["user_id"])
+    coordinator = EchoRoboticsDataUpdateCoordinator(
+        hass, api, smartmode, smartfetch, mode_timeline, config_fingerprint, fleet
+    )
+    if hass.state is not CoreState.running:
+        # don't let all entries do their first refresh at the same time,
+        # reloads later on don't have to wait
+        await asyncio.sleep(coordinator.poll_scheduler.startup_delay())
     await coordinator.async_config_entry_first_refresh()
+    # only set up entries are in here, fleet sensors are handed over between them
+    hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -74,11 +115,46 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: EchoRoboticsDataUpdateCoordinator = hass.data[DOMAIN].pop(
+            entry.entry_id
+        )
+        fleet = coordinator.fleet
+        for robot_id in coordinator.api.robot_ids:
+            fleet.remove_robot(robot_id)
+        fleet.async_commit()
+        if not any(
+            other.api.budget is coordinator.api.budget
+            for other in hass.data[DOMAIN].values()
+        ):
+            # last loaded entry of the account
+            async_remove_budget(hass, entry.data["user_id"])
+        if fleet.owner_entry_id == entry.entry_id:
+            _async_hand_over_fleet(hass, fleet)
 
     return unload_ok
 
 
+@callback
+def _async_hand_over_fleet(hass: HomeAssistant, fleet: FleetAggregate) -> None:
+    """Move the fleet sensors to another loaded entry of the account, if any"""
+    fleet.owner_entry_id = None
+    for entry_id, other in hass.data[DOMAIN].items():
+        if other.fleet is not fleet:
+            continue
+        fleet.owner_entry_id = entry_id
+        # otherwise the sensor platform isn't set up yet, and adds them itself
+        if other.async_add_fleet_sensors is not None:
+            other.async_add_fleet_sensors()
+        return
+    async_remove_fleet(hass, fleet.user_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a config entry."""
+    await ModeTimeline(hass, entry.entry_id, entry.data["robot_id"]).async_remove()
+    await ConfigFingerprint(hass, entry.entry_id, entry.data["robot_id"]).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate old entry."""
     _LOGGER.debug("Migrating from version %s", config_entry.version)
@@ -126,9 +202,12 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
     def __init__(
         self,
         hass,
-        api: echoroboticsapi.Api,
+        api: EchoRoboticsApi,
         smartmode: echoroboticsapi.SmartMode,
         smartfetch: echoroboticsapi.SmartFetch,
+        mode_timeline: ModeTimeline,
+        config_fingerprint: ConfigFingerprint,
+        fleet: FleetAggregate,
     ):
         """Initialize my coordinator."""
         super().__init__(
@@ -140,6 +219,19 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
         self.api = api
         self.smartmode = smartmode
         self.smartfetch = smartfetch
+        self.mode_timeline = mode_timeline
+        self.config_fingerprint = config_fingerprint
+        self.fleet = fleet
+        self.async_add_fleet_sensors: Callable[[], None] | None = None
+        """set up by the sensor platform, for when this entry becomes the fleet's owner"""
+        self.poll_scheduler = async_get_poll_scheduler(hass)
+        self.poll_key = "-".join(api.robot_ids)
+        """stable key for poll_scheduler, so polls of all coordinators are spread out"""
+
+        self.monotonic: Callable[[], float] = time.monotonic
+        """clock used for all tstamps below, replay.py replaces it"""
+        self.profiler: IntegrationProfiler | None = None
+        """set by the profile service while it runs"""
 
         self.history_tstamp: int = 0
 
@@ -149,6 +241,31 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
         self.laststatuses_tstamp: int = 0
         self.fetch_fail_count: int = 0
 
+        self.status_infos: dict[RobotId, echoroboticsapi.StatusInfo] = {}
+        """statuses_info of laststatuses_data, by robot"""
+        self.status_records: dict[RobotId, StatusRecord] = {}
+        """what the statuses in status_infos mean, by robot"""
+        self._robot_snapshots: dict[RobotId, tuple] = {}
+        self._robot_listeners: dict[RobotId | None, set[CALLBACK_TYPE]] = {}
+        """index of listeners by context, which is the robot_id for entities"""
+        self._changed_robots: set[RobotId] | None = None
+        """robots that changed in the last refresh, None means all"""
+        self.stuck_detectors: dict[RobotId, StuckDetector] = {
+            robot_id: StuckDetector() for robot_id in api.robot_ids
+        }
+        self.telemetry = TelemetryHistory()
+        self.tasks = CoordinatorTaskGroup(
+            f"echorobotics {self.poll_key}",
+            TASK_GROUP_MAX_CONCURRENCY,
+            async_get_task_stats(hass, self.poll_key),
+        )
+        """background tasks, like delayed refreshes and set_mode calls"""
+        self._robot_statuses: dict[RobotId, str] = {}
+        self.alarm_robots: set[RobotId] = set()
+        """robots in a status with is_error"""
+        self._alarm_poll_until: float = 0
+        """polling every ALARM_POLL_INTERVAL until then, while there are alarm_robots"""
+
         self.pending_mode: echoroboticsapi.Mode | None = None
         """pending_mode used for improved handling of echorobotics long response time
         
@@ -158,16 +275,20 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def async_schedule_multiple_refreshes(self):
         async def refresh_later(sleep: float):
-            await asyncio.sleep(sleep)
             _LOGGER.debug("fetching state after %ss", sleep)
             await self.async_request_refresh()
 
         for sleeptime in [2, 10, 20, 40, 60]:
-            task = asyncio.create_task(refresh_later(sleeptime))
+            self.tasks.spawn(refresh_later(sleeptime), delay=sleeptime)
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes and background tasks, called when the entry unloads"""
+        await super().async_shutdown()
+        await self.tasks.async_shutdown(TASK_SHUTDOWN_DEADLINE.total_seconds())
 
     def _should_be_unavailable(self):
         too_old: bool = (
-            time.monotonic()
+            self.monotonic()
             > self.laststatuses_tstamp + UNAVAILABLE_TIMEOUT.total_seconds()
         )
         too_many_fetches_failed: bool = self.fetch_fail_count >= UNAVAILABLE_FETCHES
@@ -176,28 +297,225 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
 
     def get_status_info(self, robot_id: RobotId) -> echoroboticsapi.StatusInfo | None:
         if self.laststatuses_data is not None and (not self._should_be_unavailable()):
-            laststatuses: echoroboticsapi.models.LastStatuses = self.laststatuses_data
-            for si in laststatuses.statuses_info:
-                if si.robot == robot_id:
-                    return si
-            _LOGGER.warning("robot_id %s not found in %s", robot_id, laststatuses)
+            si = self.status_infos.get(robot_id)
+            if si is not None:
+                return si
+            _LOGGER.warning(
+                "robot_id %s not found in %s", robot_id, self.laststatuses_data
+            )
         return None
 
+    def get_status_record(self, robot_id: RobotId) -> StatusRecord | None:
+        """What the status of robot_id means, None when get_status_info() is"""
+        if self.get_status_info(robot_id) is None:
+            return None
+        return self.status_records.get(robot_id)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates.
+
+        Entities pass their robot_id as context.
+        They are then only called when data of that robot changed,
+        see async_update_listeners.
+        """
+        remove = super().async_add_listener(update_callback, context)
+        self._robot_listeners.setdefault(context, set()).add(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            listeners = self._robot_listeners[context]
+            listeners.discard(update_callback)
+            if not listeners:
+                del self._robot_listeners[context]
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners of robots that changed in the last refresh.
+
+        Listeners without context are always updated.
+        When the last refresh didn't tell which robots changed, all listeners are updated.
+        Profiled while the profile service runs.
+        """
+        if self.profiler is None:
+            self._update_changed_listeners()
+        else:
+            self.profiler.runcall(self._update_changed_listeners)
+
+    @callback
+    def _update_changed_listeners(self) -> None:
+        changed = self._changed_robots
+        self._changed_robots = None
+        if changed is None:
+            super().async_update_listeners()
+            return
+        for context in (None, *changed):
+            for update_callback in list(self._robot_listeners.get(context, ())):
+                update_callback()
+
+    def _update_status_infos(self) -> set[RobotId]:
+        """Index laststatuses_data by robot, return robots whose data changed"""
+        status_infos: dict[RobotId, echoroboticsapi.StatusInfo] = {}
+        if self.laststatuses_data is not None:
+            status_infos = {si.robot: si for si in self.laststatuses_data.statuses_info}
+        self.status_infos = status_infos
+        self.status_records = {
+            robot_id: status_record(si.status) for robot_id, si in status_infos.items()
+        }
+
+        mode = self.smartmode.get_robot_mode()
+        snapshots: dict[RobotId, tuple] = {}
+        for robot_id, si in status_infos.items():
+            # not comparing whole StatusInfos, query_time changes on every fetch
+            snapshots[robot_id] = (
+                si.status,
+                si.date,
+                si.estimated_battery_level,
+                si.position,
+                si.is_online,
+                mode if robot_id == self.smartmode.robot_id else None,
+                self.pending_mode,
+            )
+        old_snapshots = self._robot_snapshots
+        self._robot_snapshots = snapshots
+        changed = {
+            robot_id
+            for robot_id, snapshot in snapshots.items()
+            if old_snapshots.get(robot_id) != snapshot
+        }
+        changed.update(old_snapshots.keys() - snapshots.keys())
+        return changed
+
+    def _update_fleet(self, robot_ids: Iterable[RobotId]) -> None:
+        """Report robots to the account's FleetAggregate"""
+        unavailable = self._should_be_unavailable()
+        for robot_id in robot_ids:
+            si = None if unavailable else self.status_infos.get(robot_id)
+            if si is None:
+                self.fleet.update_robot(robot_id, None, None)
+            else:
+                self.fleet.update_robot(
+                    robot_id,
+                    self.status_records[robot_id].normalized,
+                    si.estimated_battery_level,
+                )
+        self.fleet.async_commit()
+
+    def _update_stuck_detectors(self, robot_ids: Iterable[RobotId]) -> None:
+        """Feed new statuses to the StuckDetectors, fire EVENT_STUCK for new stucks"""
+        for robot_id in robot_ids:
+            si = self.status_infos.get(robot_id)
+            detector = self.stuck_detectors.get(robot_id)
+            if si is None or detector is None:
+                continue
+            if not detector.update(si, self.status_records[robot_id].is_working):
+                continue
+            if detector.stuck:
+                _LOGGER.info("%s seems to be stuck", robot_id)
+                self.hass.bus.async_fire(
+                    EVENT_STUCK,
+                    {
+                        "robot_id": robot_id,
+                        "status": si.status,
+                        "latitude": si.position.latitude,
+                        "longitude": si.position.longitude,
+                        "spread": detector.spread,
+                    },
+                )
+
+    @property
+    def alarm_polling(self) -> bool:
+        return bool(self.alarm_robots) and self.monotonic() < self._alarm_poll_until
+
+    def _schedule_next_poll(self) -> None:
+        if self.alarm_polling:
+            self.update_interval = ALARM_POLL_INTERVAL
+            return
+        # schedule the next poll at this coordinator's phase, see poll_scheduler.py
+        self.update_interval = timedelta(
+            seconds=self.poll_scheduler.next_delay(self.poll_key, time.time())
+        )
+
+    def _update_alarms(self, robot_ids: Iterable[RobotId]) -> None:
+        """Track robots going into and out of statuses with is_error
+
+        A robot changing to a status with is_error, like going into alarm
+        or from Warning to Alarm, fires EVENT_ALARM and (re)starts polling every
+        ALARM_POLL_INTERVAL, until all robots recovered
+        or ALARM_POLL_MAX_DURATION passed.
+        Robots already in alarm when first seen, like after a restart, don't.
+        """
+        for robot_id in robot_ids:
+            si = self.status_infos.get(robot_id)
+            if si is None:
+                continue
+            previous = self._robot_statuses.get(robot_id)
+            self._robot_statuses[robot_id] = si.status
+            if not self.status_records[robot_id].is_error:
+                self.alarm_robots.discard(robot_id)
+                continue
+            self.alarm_robots.add(robot_id)
+            if previous is None or previous == si.status:
+                continue
+            _LOGGER.info("%s went into %s", robot_id, si.status)
+            self.hass.bus.async_fire(
+                EVENT_ALARM,
+                {
+                    "robot_id": robot_id,
+                    "status": si.status,
+                    "previous_status": previous,
+                    "date": si.date.isoformat(),
+                    "battery": si.estimated_battery_level,
+                    "latitude": si.position.latitude,
+                    "longitude": si.position.longitude,
+                    "is_online": si.is_online,
+                },
+            )
+            self._alarm_poll_until = (
+                self.monotonic() + ALARM_POLL_MAX_DURATION.total_seconds()
+            )
+
+    def _record_telemetry(self, robot_ids: Iterable[RobotId]) -> None:
+        mode = self.smartmode.get_robot_mode()
+        for robot_id in robot_ids:
+            if (si := self.status_infos.get(robot_id)) is not None:
+                self.telemetry.append(
+                    si, mode if robot_id == self.smartmode.robot_id else None
+                )
+
     async def _fetch_getconfig(self):
         """Fetch getconfig from robot, but not on every update"""
         time_to_fetch = (
-            time.monotonic()
+            self.monotonic()
             > self.getconfig_tstamp + GETCONFIG_UPDATE_INTERVAL.total_seconds()
         )
 
         if self.getconfig_data is None or time_to_fetch:
+            fingerprint = self.config_fingerprint
+            if fingerprint.is_fresh:
+                # unchanged since it was validated, no need to bother the robot
+                _LOGGER.debug("fetching getconfig reload=False, checking fingerprint")
+                async with budget_timeout(10):
+                    cached = await self.api.get_config(reload=False)
+                if fingerprint.matches(cached):
+                    _LOGGER.debug("getconfig matches fingerprint")
+                    self._set_getconfig(cached)
+                    # fetch again when the persisted one is due, not an interval later
+                    self.getconfig_tstamp = self.monotonic() - fingerprint.age
+                    return
+
             newdata: echoroboticsapi.GetConfig | None = None
             _LOGGER.debug("fetching getconfig reload=True")
 
-            async with async_timeout.timeout(10):
+            async with budget_timeout(10):
                 await self.api.get_config(reload=True)
 
-            async with async_timeout.timeout(30):
+            async with budget_timeout(30):
                 while newdata is None or not newdata.config_validated:
                     await asyncio.sleep(2)
                     _LOGGER.debug("fetching getconfig reload=False")
@@ -208,10 +526,40 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
                 self.getconfig_data = None
                 _LOGGER.debug("could not getconfig")
             else:
-                self.getconfig_data = newdata
-                self.getconfig_tstamp = time.monotonic()
+                self._set_getconfig(newdata)
+                self.getconfig_tstamp = self.monotonic()
+                self.config_fingerprint.async_update(newdata)
+
+    @callback
+    def _set_getconfig(self, getconfig: echoroboticsapi.GetConfig) -> None:
+        """Store getconfig, push a changed brain_version to the device registry"""
+        self.getconfig_data = getconfig
+        if getconfig.data is None:
+            return
+        dev_reg = device_registry.async_get(self.hass)
+        # get_config() without robot_id is about the first robot
+        robot_id = self.api.robot_ids[0]
+        device = dev_reg.async_get_device(identifiers={(DOMAIN, robot_id)})
+        brain_version = getconfig.data.brain_version
+        if device is not None and device.sw_version != brain_version:
+            _LOGGER.debug("brain_version changed to %s", brain_version)
+            dev_reg.async_update_device(device.id, sw_version=brain_version)
 
     async def _async_update_data(self) -> bool:
+        """Fetch data, see _async_fetch_data, then schedule the next poll
+
+        DataUpdateCoordinator schedules the next refresh update_interval after
+        the refresh finished, so the delay to the next phase is computed last.
+        Profiled while the profile service runs.
+        """
+        try:
+            if self.profiler is None:
+                return await self._async_fetch_data()
+            return await self.profiler.profile_coroutine(self._async_fetch_data())
+        finally:
+            self._schedule_next_poll()
+
+    async def _async_fetch_data(self) -> bool:
         """Fetch data from API endpoint.
 
         We don't actually use the return value of this
@@ -230,10 +578,12 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
         Every return causes entities to be updated, which decide their own availability based on BaseEchoRoboticsEntity::available().
         The first re-raised error does that too. Consecutive ones do not.
         """
+        was_unavailable = self._should_be_unavailable()
+        self._changed_robots = None
 
         exception = None
         try:
-            async with async_timeout.timeout(1):
+            async with budget_timeout(1):
                 await self.api.current()
         except aiohttp.ClientResponseError as e:
             if e.status == 401:
@@ -253,7 +603,7 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
         try:
 
             async def _smartfetch():
-                async with async_timeout.timeout(5):
+                async with budget_timeout(5):
                     status = await self.smartfetch.smart_fetch()
                     if status is None:
                         _LOGGER.info("received empty update")
@@ -261,13 +611,21 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
                         _LOGGER.debug("received state %s", status)
                     return status
 
+            # not a TaskGroup: a failing fetch must not cancel the other one,
+            # like a getconfig reload that is waiting for the robot
+            fetches = [self._fetch_getconfig(), _smartfetch()]
+            if (profiler := self.profiler) is not None:
+                # gather runs them in tasks, outside of the profiled steps of this one
+                fetches = [profiler.profile_coroutine(fetch) for fetch in fetches]
             fetch_result, status = await asyncio.gather(
-                self._fetch_getconfig(), _smartfetch(), return_exceptions=True
+                *fetches, return_exceptions=True
             )
 
-            if isinstance(fetch_result, Exception):
+            if isinstance(fetch_result, BaseException):
+                if isinstance(status, BaseException):
+                    _LOGGER.debug("smartfetch failed as well", exc_info=status)
                 raise fetch_result
-            if isinstance(status, Exception):
+            if isinstance(status, BaseException):
                 raise status
         except aiohttp.ClientResponseError as e:
             if e.status == 401:
@@ -279,7 +637,19 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
         else:
             self.fetch_fail_count = -1  # will be set to 0 by finally
             self.laststatuses_data = status
-            self.laststatuses_tstamp = time.monotonic()
+            self.laststatuses_tstamp = self.monotonic()
+            self.mode_timeline.async_record(
+                self.smartmode.get_robot_mode(), MODE_SOURCE_OBSERVED
+            )
+            changed_robots = self._update_status_infos()
+            # entities of all robots have to report being available again
+            self._changed_robots = None if was_unavailable else changed_robots
+            self._update_fleet(
+                self.status_infos.keys() if was_unavailable else changed_robots
+            )
+            self._update_stuck_detectors(changed_robots)
+            self._record_telemetry(changed_robots)
+            self._update_alarms(changed_robots)
         finally:
             self.fetch_fail_count += 1
 
@@ -290,10 +660,13 @@ class EchoRoboticsDataUpdateCoordinator(DataUpdateCoordinator):
                     self.fetch_fail_count,
                     exc_info=exception,
                 )
+                self._update_fleet(self.api.robot_ids)
             raise exception
         else:
             ret = exception is None
             if not ret:
+                # staying available with the old data, no entity has to be updated
+                self._changed_robots = set()
                 _LOGGER.info(
                     "fetch failure, staying available for now (count=%s)",
                     self.fetch_fail_count,
@@ -0,0 +1,374 @@
+"""echoroboticsapi.Api as used by this integration"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import datetime
+from functools import partial
+import logging
+import time
+from typing import Any, TypeVar
+
+import aiohttp
+from aiohttp import ClientResponse, ClientSession
+import echoroboticsapi
+import pydantic
+from yarl import URL
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util.json import json_loads
+
+from .api_trace import (
+    ApiExchange,
+    PayloadRingBuffer,
+    TraceRecorder,
+    FAILED_EXCHANGE_STATUS,
+)
+from .budget import (
+    RequestBudget,
+    request_priority,
+    PRIORITY_COMMAND,
+    PRIORITY_STATUS,
+    PRIORITY_CONFIG,
+    PRIORITY_HISTORY,
+)
+from .const import (
+    RobotId,
+    DATA_BUDGETS,
+    REQUEST_BUDGET_RATE,
+    REQUEST_BUDGET_CAPACITY,
+    PAYLOAD_BUFFER_MAX_ENTRIES,
+    PAYLOAD_BUFFER_MAX_BYTES,
+    DATA_PARSE_EXECUTOR,
+    PARSE_MAX_WORKERS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+def _priority_from_url(url: URL) -> int:
+    path = url.path
+    if path.endswith("/SetMode"):
+        return PRIORITY_COMMAND
+    if "/RobotConfig/" in path:
+        return PRIORITY_CONFIG
+    if "/History/" in path:
+        return PRIORITY_HISTORY
+    return PRIORITY_STATUS
+
+
+def _parse_model(model: type[_T], name: str, body: bytes) -> _T:
+    try:
+        return model.model_validate_json(body)
+    except pydantic.ValidationError:
+        _LOGGER.exception("%s: error was caused by json %s", name, body)
+        raise
+
+
+def _parse_history_list(
+    body: bytes,
+) -> list[echoroboticsapi.models.HistoryEventCombinedModel]:
+    try:
+        return [
+            echoroboticsapi.models.HistoryEventCombinedModel.model_validate(obj)
+            for obj in json_loads(body)
+        ]
+    except pydantic.ValidationError:
+        _LOGGER.exception("history_list: error was caused by json %s", body)
+        raise
+
+
+def _parser_from_url(url: URL) -> Callable[[bytes], Any] | None:
+    """How to parse the response of url in the executor, None for small responses"""
+    path = url.path
+    if path.endswith("/RobotData/LastStatuses"):
+        return partial(_parse_model, echoroboticsapi.LastStatuses, "last_statuses")
+    if "/RobotConfig/GetConfig/" in path:
+        return partial(_parse_model, echoroboticsapi.GetConfig, "get_config")
+    if path.endswith("/History/list"):
+        return _parse_history_list
+    return None
+
+
+def _timed(func: Callable[..., _T], *args: Any) -> tuple[_T, float]:
+    start = time.perf_counter()
+    return func(*args), time.perf_counter() - start
+
+
+@dataclass
+class ParseStats:
+    """Where the time for turning responses into models is spent"""
+
+    count: int = 0
+    executor_time: float = 0
+    """seconds spent parsing in the executor"""
+    max_executor_time: float = 0
+    loop_time: float = 0
+    """seconds spent on the event loop from reading a response until the result
+    was returned, not counting the wait for the executor"""
+    max_loop_time: float = 0
+
+    def add(self, executor_time: float, loop_time: float) -> None:
+        self.count += 1
+        self.executor_time += executor_time
+        self.max_executor_time = max(self.max_executor_time, executor_time)
+        self.loop_time += loop_time
+        self.max_loop_time = max(self.max_loop_time, loop_time)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "executor_time": round(self.executor_time, 4),
+            "max_executor_time": round(self.max_executor_time, 4),
+            "loop_time": round(self.loop_time, 4),
+            "max_loop_time": round(self.max_loop_time, 4),
+        }
+
+
+@dataclass
+class _ParseTiming:
+    """Filled in while an api call runs, see EchoRoboticsApi._measure_parse"""
+
+    read_at: float | None = None
+    """perf_counter() when the response body was read"""
+    executor_time: float = 0
+    executor_wait: float = 0
+    """seconds the event loop waited for the executor"""
+
+
+_parse_timing: ContextVar[_ParseTiming | None] = ContextVar(
+    "echorobotics_parse_timing", default=None
+)
+
+
+class ParsedResponse:
+    """ClientResponse whose json() parses the body to models in the parse executor
+
+    echoroboticsapi.Api calls model_validate() on what json() returns.
+    Given a model instance, pydantic returns it as is, without validating again.
+    """
+
+    def __init__(
+        self,
+        response: ClientResponse,
+        body: bytes,
+        parse: Callable[[bytes], Any],
+        executor: ThreadPoolExecutor,
+    ):
+        self._response = response
+        self._body = body
+        self._parse = parse
+        self._executor = executor
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    async def json(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result, executor_time = await asyncio.get_running_loop().run_in_executor(
+            self._executor, _timed, self._parse, self._body
+        )
+        if (timing := _parse_timing.get()) is not None:
+            timing.executor_time += executor_time
+            timing.executor_wait += time.perf_counter() - start
+        return result
+
+
+@dataclass
+class RequestStats:
+    """Counters over all requests, exposed by the metrics view"""
+
+    count: int = 0
+    failures: int = 0
+    """requests raising an error or answered with an error status"""
+    duration: float = 0
+    """seconds from sending a request until its body was read"""
+    max_duration: float = 0
+
+    def add(self, duration: float, failed: bool) -> None:
+        self.count += 1
+        self.failures += failed
+        self.duration += duration
+        self.max_duration = max(self.max_duration, duration)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "duration": round(self.duration, 4),
+            "max_duration": round(self.max_duration, 4),
+        }
+
+
+class EchoRoboticsApi(echoroboticsapi.Api):
+    """echoroboticsapi.Api, with every request going through a RequestBudget
+
+    Recent responses are kept in self.payloads for diagnostics.
+    While self.trace_recorder is set, all responses are also written to a trace file.
+
+    last_statuses, get_config and history_list return large payloads,
+    so their responses are parsed in parse_executor instead of on the event loop,
+    see ParsedResponse. The methods themselves are the library's.
+    """
+
+    def __init__(
+        self,
+        websession: ClientSession,
+        robot_ids: RobotId | list[RobotId],
+        budget: RequestBudget,
+        parse_executor: ThreadPoolExecutor,
+    ):
+        super().__init__(websession=websession, robot_ids=robot_ids)
+        self.budget = budget
+        self.parse_executor = parse_executor
+        self.parse_stats = ParseStats()
+        self.request_stats = RequestStats()
+        self.payloads = PayloadRingBuffer(
+            PAYLOAD_BUFFER_MAX_ENTRIES, PAYLOAD_BUFFER_MAX_BYTES
+        )
+        self.trace_recorder: TraceRecorder | None = None
+
+    async def request(
+        self, method: str, url: URL, **kwargs
+    ) -> ClientResponse | ParsedResponse:
+        priority = request_priority.get()
+        if priority is None:
+            priority = _priority_from_url(url)
+        await self.budget.acquire(priority)
+
+        tstamp = time.time()
+        start = time.monotonic()
+        try:
+            response = await super().request(method, url, **kwargs)
+            # the body is read anyway, Api methods call response.json() next
+            body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # timeouts around api calls show up as CancelledError in here
+            duration = time.monotonic() - start
+            self.request_stats.add(duration, True)
+            self._record(
+                ApiExchange(
+                    tstamp,
+                    method,
+                    str(url),
+                    FAILED_EXCHANGE_STATUS,
+                    duration,
+                    type(e).__name__.encode(),
+                )
+            )
+            raise
+        duration = time.monotonic() - start
+        self.request_stats.add(duration, response.status >= 400)
+        self._record(
+            ApiExchange(
+                tstamp,
+                method,
+                str(url),
+                response.status,
+                duration,
+                body,
+            )
+        )
+        if (timing := _parse_timing.get()) is not None:
+            timing.read_at = time.perf_counter()
+        if (parse := _parser_from_url(url)) is not None:
+            return ParsedResponse(response, body, parse, self.parse_executor)
+        return response
+
+    @contextmanager
+    def _measure_parse(self) -> Iterator[None]:
+        """Add the parse time of the api call run inside to parse_stats"""
+        timing = _ParseTiming()
+        token = _parse_timing.set(timing)
+        try:
+            yield
+        finally:
+            _parse_timing.reset(token)
+        if timing.read_at is not None:
+            loop_time = time.perf_counter() - timing.read_at - timing.executor_wait
+            self.parse_stats.add(timing.executor_time, loop_time)
+
+    async def last_statuses(self) -> echoroboticsapi.LastStatuses:
+        with self._measure_parse():
+            return await super().last_statuses()
+
+    async def get_config(
+        self, reload: bool, robot_id: RobotId | None = None
+    ) -> echoroboticsapi.GetConfig:
+        with self._measure_parse():
+            return await super().get_config(reload, robot_id)
+
+    async def history_list(
+        self,
+        robot_id: RobotId | None = None,
+        date_from: datetime.datetime | None = None,
+        date_to: datetime.datetime | None = None,
+    ) -> list[echoroboticsapi.HistoryEvent]:
+        with self._measure_parse():
+            return await super().history_list(robot_id, date_from, date_to)
+
+    def _record(self, exchange: ApiExchange) -> None:
+        self.payloads.append(exchange)
+        if self.trace_recorder is not None:
+            self.trace_recorder.append(exchange)
+
+
+@callback
+def async_get_budget(hass: HomeAssistant, user_id: str) -> RequestBudget:
+    """Get the RequestBudget of an account, shared between config entries"""
+    budgets: dict[str, RequestBudget] = hass.data.setdefault(DATA_BUDGETS, {})
+    if user_id not in budgets:
+        budgets[user_id] = RequestBudget(REQUEST_BUDGET_RATE, REQUEST_BUDGET_CAPACITY)
+    return budgets[user_id]
+
+
+@callback
+def async_remove_budget(hass: HomeAssistant, user_id: str) -> None:
+    """Forget the RequestBudget of an account, once none of its entries is loaded"""
+    hass.data.get(DATA_BUDGETS, {}).pop(user_id, None)
+
+
+@callback
+def async_get_parse_executor(hass: HomeAssistant) -> ThreadPoolExecutor:
+    """Get the thread pool parsing responses, shared between config entries"""
+    if DATA_PARSE_EXECUTOR not in hass.data:
+        executor = ThreadPoolExecutor(
+            max_workers=PARSE_MAX_WORKERS, thread_name_prefix="echorobotics_parse"
+        )
+
+        @callback
+        def _shutdown(_event: Event) -> None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown)
+        hass.data[DATA_PARSE_EXECUTOR] = executor
+    return hass.data[DATA_PARSE_EXECUTOR]
+
+
+@callback
+def async_create_api(
+    hass: HomeAssistant,
+    user_id: str,
+    user_token: str,
+    robot_ids: RobotId | list[RobotId],
+) -> EchoRoboticsApi:
+    return EchoRoboticsApi(
+        websession=async_create_clientsession(
+            hass,
+            cookies=echoroboticsapi.create_cookies(
+                user_id=user_id, user_token=user_token
+            ),
+        ),
+        robot_ids=robot_ids,
+        budget=async_get_budget(hass, user_id),
+        parse_executor=async_get_parse_executor(hass),
+    )
@@ -0,0 +1,172 @@
+"""Keep raw api responses around, for diagnostics and replay
+
+PayloadRingBuffer keeps the most recent ones in memory for the diagnostics download.
+TraceRecorder writes all of them to a trace file for a while, see replay.py to replay it.
+
+Trace files are gzipped json lines.
+The first line is a header dict, every other line is one ApiExchange as a list,
+with tstamp relative to the header's "started" and body as text.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import gzip
+import json
+import logging
+import time
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import json_loads
+
+from .const import RobotId, TRACE_FLUSH_ENTRIES
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+FAILED_EXCHANGE_STATUS = 0
+"""status of exchanges that got no response, their body is the exception name"""
+
+
+class ApiExchange(NamedTuple):
+    """One request to echorobotics.com and its raw response"""
+
+    tstamp: float
+    """wall clock time (time.time()) the request was started"""
+    method: str
+    url: str
+    status: int
+    duration: float
+    """seconds between sending the request and having read the response body"""
+    body: bytes
+
+    def as_dict(self) -> dict:
+        """Decode body, only do this when actually needed"""
+        try:
+            payload = json_loads(self.body)
+        except ValueError:
+            payload = self.body.decode(errors="replace")
+        return {
+            "tstamp": self.tstamp,
+            "method": self.method,
+            "url": self.url,
+            "status": self.status,
+            "duration": round(self.duration, 4),
+            "payload": payload,
+        }
+
+
+class PayloadRingBuffer:
+    """Bounded list of the most recent ApiExchanges
+
+    Bounded by number of entries and by total body size.
+    Adding only stores references, bodies are decoded in as_list().
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._exchanges: deque[ApiExchange] = deque(maxlen=max_entries)
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return len(self._exchanges)
+
+    @property
+    def size(self) -> int:
+        """total size of all bodies in bytes"""
+        return self._size
+
+    def append(self, exchange: ApiExchange) -> None:
+        exchanges = self._exchanges
+        if len(exchanges) == exchanges.maxlen:
+            self._size -= len(exchanges[0].body)
+        exchanges.append(exchange)
+        self._size += len(exchange.body)
+        while self._size > self.max_bytes and len(exchanges) > 1:
+            self._size -= len(exchanges.popleft().body)
+
+    def as_list(self) -> list[dict]:
+        return [exchange.as_dict() for exchange in self._exchanges]
+
+
+def _write_trace_lines(path: str, lines: list[list | dict], mode: str) -> None:
+    with gzip.open(path, mode + "t", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line, separators=(",", ":")))
+            f.write("\n")
+
+
+def read_trace(path: str) -> tuple[dict, list[ApiExchange]]:
+    """Read a trace file written by TraceRecorder. Does blocking I/O.
+
+    The tstamp of the returned exchanges is relative to header["started"].
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"unsupported trace version in {header}")
+        exchanges = [
+            ApiExchange(tstamp, method, url, status, duration, body.encode())
+            for tstamp, method, url, status, duration, body in map(json.loads, f)
+        ]
+    return header, exchanges
+
+
+class TraceRecorder:
+    """Writes every ApiExchange it gets to a trace file
+
+    Exchanges are collected in memory and written in chunks of TRACE_FLUSH_ENTRIES
+    in the executor, so memory use stays bounded for long recordings.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, robot_ids: list[RobotId]):
+        self.hass = hass
+        self.path = path
+        self.robot_ids = robot_ids
+        self.started = time.time()
+        self.count: int = 0
+        self._pending: list[ApiExchange] = []
+        self._lock = asyncio.Lock()
+        self._header_written = False
+        self._flush_scheduled = False
+
+    @callback
+    def append(self, exchange: ApiExchange) -> None:
+        self._pending.append(exchange)
+        self.count += 1
+        if len(self._pending) >= TRACE_FLUSH_ENTRIES and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.async_create_background_task(
+                self.async_flush(), "echorobotics trace flush"
+            )
+
+    async def async_flush(self) -> None:
+        async with self._lock:
+            pending, self._pending = self._pending, []
+            self._flush_scheduled = False
+            lines: list[list | dict] = [
+                [
+                    round(e.tstamp - self.started, 3),
+                    e.method,
+                    e.url,
+                    e.status,
+                    round(e.duration, 4),
+                    e.body.decode(errors="replace"),
+                ]
+                for e in pending
+            ]
+            mode = "a"
+            if not self._header_written:
+                header = {
+                    "version": TRACE_VERSION,
+                    "started": self.started,
+                    "robot_ids": self.robot_ids,
+                }
+                lines.insert(0, header)
+                mode = "w"
+            await self.hass.async_add_executor_job(
+                _write_trace_lines, self.path, lines, mode
+            )
+            self._header_written = True
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -8,7 +7,9 @@ import echoroboticsapi
 
 
 from . import EchoRoboticsDataUpdateCoordinator
+from .budget import api_priority, budget_timeout, PRIORITY_COMMAND
 from .const import DOMAIN, RobotId
+from .mode_timeline import MODE_SOURCE_SET_MODE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,7 +20,8 @@ class EchoRoboticsBaseEntity(CoordinatorEntity[EchoRoboticsDataUpdateCoordinator
     def __init__(
         self, robot_id: RobotId, coordinator: EchoRoboticsDataUpdateCoordinator
     ):
-        super().__init__(coordinator)
+        # the coordinator only notifies us when data of our robot changed
+        super().__init__(coordinator, context=robot_id)
         self.logger = logging.getLogger(__name__)
         self.robot_id = robot_id
 
@@ -48,6 +50,12 @@ class EchoRoboticsBaseEntity(CoordinatorEntity[EchoRoboticsDataUpdateCoordinator
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if (profiler := self.coordinator.profiler) is not None:
+            profiler.runcall(self._update_from_coordinator)
+        else:
+            self._update_from_coordinator()
+
+    def _update_from_coordinator(self) -> None:
         self._read_coordinator_data()
         self.async_write_ha_state()
 
@@ -83,6 +91,9 @@ class EchoRoboticsBaseEntity(CoordinatorEntity[EchoRoboticsDataUpdateCoordinator
 
         If set_mode fails, pending_mode is also set back to None,
         causing entities to report the old state again.
+
+        A verified mode change is recorded in coord.mode_timeline,
+        so it survives restarts.
         """
         if self.pending_mode is not None:
             self.logger.warning(
@@ -91,15 +102,24 @@ class EchoRoboticsBaseEntity(CoordinatorEntity[EchoRoboticsDataUpdateCoordinator
             return
 
         coord: EchoRoboticsDataUpdateCoordinator = self.coordinator
+
+        async def set_mode() -> int:
+            # inside the task, so that RequestBudget.acquire sees the timeout
+            async with budget_timeout(40):
+                return await coord.api.set_mode(mode, use_current=True)
+
         await coord.async_schedule_multiple_refreshes()
         self.coordinator.pending_mode = mode
         try:
-            job = asyncio.create_task(coord.api.set_mode(mode, use_current=True))
+            with api_priority(PRIORITY_COMMAND):
+                # the task copies the context, and with it the priority
+                job = coord.tasks.spawn(set_mode())
             self.async_write_ha_state()  # cause entities to report pending_mode
-            async with asyncio.timeout(40):
-                await job  # perform set_mode call
-                # this returns as soon as api.current() reports it has worked,
-                # which will also cause get_robot_mode() to report the new mode
+            result = await job  # perform set_mode call
+            # this returns as soon as api.current() reports it has worked,
+            # which will also cause get_robot_mode() to report the new mode
+            if result == 200:
+                coord.mode_timeline.async_record(mode, MODE_SOURCE_SET_MODE)
         finally:
             self.coordinator.pending_mode = None
             self.async_write_ha_state()  # cause entities to report the new actual mode
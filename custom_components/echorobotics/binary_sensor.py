@@ -0,0 +1,50 @@
+"""Platform for binary_sensor integration."""
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import EchoRoboticsDataUpdateCoordinator
+from .base import EchoRoboticsBaseEntity
+from .const import DOMAIN, RobotId
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up binary_sensor entries."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [
+            EchoRoboticsStuckSensor(
+                robot_id=entry.data["robot_id"], coordinator=coordinator
+            ),
+        ]
+    )
+
+
+class EchoRoboticsStuckSensor(EchoRoboticsBaseEntity, BinarySensorEntity):
+    """On while the robot reports working, but doesn't move, see stuck.py"""
+
+    def __init__(
+        self, robot_id: RobotId, coordinator: EchoRoboticsDataUpdateCoordinator
+    ):
+        super().__init__(robot_id, coordinator)
+        self._attr_unique_id = f"{robot_id}-stuck"
+        self._attr_device_class = BinarySensorDeviceClass.PROBLEM
+        self._attr_icon = "mdi:robot-mower-outline"
+        self._attr_translation_key = "stuck"
+
+    def _read_coordinator_data(self) -> None:
+        super()._read_coordinator_data()
+        detector = self.coordinator.stuck_detectors[self.robot_id]
+        self._attr_is_on = detector.stuck
+        spread = detector.spread
+        self._attr_extra_state_attributes = {
+            "spread": None if spread is None else round(spread, ndigits=1),
+        }
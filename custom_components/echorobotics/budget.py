@@ -0,0 +1,171 @@
+"""Request budget shared by all api calls of one echorobotics account.
+
+Calls to echorobotics.com come from many places:
+polling, set_mode verification, getconfig reloads and the refresh bursts after a mode change.
+To avoid being throttled by the vendor, all of them take a token from a RequestBudget first.
+
+RequestBudget is a token bucket. When it runs empty, callers wait in line,
+ordered by priority: commands before status, config and history.
+
+Time spent waiting in line doesn't count towards a budget_timeout() around the call,
+so being throttled doesn't make a fetch time out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator, Iterator
+
+PRIORITY_COMMAND = 0
+PRIORITY_STATUS = 1
+PRIORITY_CONFIG = 2
+PRIORITY_HISTORY = 3
+
+PRIORITY_NAMES = {
+    PRIORITY_COMMAND: "command",
+    PRIORITY_STATUS: "status",
+    PRIORITY_CONFIG: "config",
+    PRIORITY_HISTORY: "history",
+}
+
+request_priority: ContextVar[int | None] = ContextVar(
+    "echorobotics_request_priority", default=None
+)
+"""Overrides the priority guessed from the url, see api_priority()"""
+
+
+@contextmanager
+def api_priority(priority: int) -> Iterator[None]:
+    """Run api calls (and tasks created) inside this block with the given priority
+
+    Useful where the url doesn't tell, like the current() calls verifying a set_mode.
+    """
+    token = request_priority.set(priority)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+_timeout_scope: ContextVar[asyncio.Timeout | None] = ContextVar(
+    "echorobotics_budget_timeout", default=None
+)
+
+
+@asynccontextmanager
+async def budget_timeout(delay: float) -> AsyncIterator[asyncio.Timeout]:
+    """asyncio.timeout(delay) around api calls, not counting waits for a RequestBudget"""
+    async with asyncio.timeout(delay) as scope:
+        token = _timeout_scope.set(scope)
+        try:
+            yield scope
+        finally:
+            _timeout_scope.reset(token)
+
+
+class RequestBudget:
+    """Token bucket with priority ordered waiters"""
+
+    def __init__(self, rate: float, capacity: int):
+        """rate is in tokens per second"""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+        self.granted: dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self.throttled: dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self.wait_time: float = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    @property
+    def usage(self) -> float:
+        """Percentage of the bucket currently used up"""
+        return (1 - self.tokens / self.capacity) * 100
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: int) -> None:
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.granted[priority] += 1
+            return
+
+        self.throttled[priority] += 1
+        # stop the clock of the budget_timeout() around us while waiting in line
+        scope = _timeout_scope.get()
+        deadline = scope.when() if scope is not None else None
+        if deadline is not None:
+            scope.reschedule(None)
+        start = time.monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self._schedule_wakeup()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # token was handed to us just before cancellation, give it back
+                self._tokens += 1
+                self._release()
+            raise
+        finally:
+            waited = time.monotonic() - start
+            self.wait_time += waited
+            if deadline is not None:
+                scope.reschedule(deadline + waited)
+        self.granted[priority] += 1
+
+    def _schedule_wakeup(self) -> None:
+        if self._wakeup is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue  # cancelled while waiting
+            self._tokens -= 1
+            fut.set_result(None)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule_wakeup()
+
+    def as_dict(self) -> dict:
+        return {
+            "tokens": round(self.tokens, 2),
+            "capacity": self.capacity,
+            "rate": self.rate,
+            "waiting": self.waiting,
+            "wait_time": round(self.wait_time, 3),
+            "granted": {PRIORITY_NAMES[p]: n for p, n in self.granted.items()},
+            "throttled": {PRIORITY_NAMES[p]: n for p, n in self.throttled.items()},
+        }
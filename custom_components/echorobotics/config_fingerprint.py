@@ -0,0 +1,99 @@
+"""Persisted fingerprint of the last validated GetConfig of a robot.
+
+Getting a validated GetConfig is expensive: get_config(reload=True) makes the robot
+send its config again, then we poll until it is validated.
+That used to happen at every startup, as the coordinator's tstamps start at 0.
+
+ConfigFingerprint stores a hash of the last validated GetConfig, along with
+when it was validated. While that is younger than GETCONFIG_UPDATE_INTERVAL,
+a cheap get_config(reload=False) matching the hash is just as good.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+
+import echoroboticsapi
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    RobotId,
+    STORAGE_VERSION,
+    GETCONFIG_UPDATE_INTERVAL,
+    GETCONFIG_FINGERPRINT_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def fingerprint(getconfig: echoroboticsapi.GetConfig) -> str:
+    """Hash of the config itself, leaving out the state of the request"""
+    return hashlib.sha256(
+        getconfig.model_dump_json(
+            include={"data", "config_id", "config_version_id", "config_date_time"}
+        ).encode()
+    ).hexdigest()
+
+
+class ConfigFingerprint:
+    def __init__(self, hass: HomeAssistant, entry_id: str, robot_id: RobotId):
+        self.robot_id = robot_id
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.getconfig"
+        )
+        self.digest: str | None = None
+        self.validated_at: float | None = None
+        """wall clock time (time.time()) the config was validated"""
+
+    @property
+    def age(self) -> float | None:
+        """Seconds since the config was validated"""
+        if self.validated_at is None:
+            return None
+        return time.time() - self.validated_at
+
+    @property
+    def is_fresh(self) -> bool:
+        age = self.age
+        return age is not None and 0 <= age < GETCONFIG_UPDATE_INTERVAL.total_seconds()
+
+    def matches(self, getconfig: echoroboticsapi.GetConfig) -> bool:
+        return getconfig.config_validated and self.digest == fingerprint(getconfig)
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if not data or data.get("robot_id") != self.robot_id:
+            return
+        try:
+            self.digest = str(data["digest"])
+            self.validated_at = float(data["validated_at"])
+        except (KeyError, TypeError, ValueError) as e:
+            _LOGGER.warning(
+                "ignoring invalid getconfig fingerprint %s", data, exc_info=e
+            )
+            self.digest = self.validated_at = None
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @callback
+    def async_update(self, getconfig: echoroboticsapi.GetConfig) -> None:
+        """Remember a freshly validated GetConfig"""
+        self.digest = fingerprint(getconfig)
+        self.validated_at = time.time()
+        self._store.async_delay_save(
+            self._data_to_save, GETCONFIG_FINGERPRINT_SAVE_DELAY
+        )
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {
+            "robot_id": self.robot_id,
+            "digest": self.digest,
+            "validated_at": self.validated_at,
+        }
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass, field
+import hashlib
 import logging
 import re
+import time
 from typing import Any
 
 import aiohttp
@@ -15,10 +19,10 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError, ConfigEntryAuthFailed
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN
+from .api import async_create_api
+from .const import DOMAIN, RobotId, DATA_ACCOUNT_LISTINGS, ACCOUNT_LISTING_CACHE_TIME
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,40 +34,99 @@ STEP_REAUTH_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate the user input allows us to connect.
+@dataclass
+class AccountListing:
+    """Robots found on an account, see async_list_robots"""
 
-    Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
-    """
+    token_hash: str
+    fetched: float
+    statuses: dict[RobotId, echoroboticsapi.StatusInfo] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
-    api = echoroboticsapi.Api(
-        websession=async_create_clientsession(
-            hass,
-            cookies=echoroboticsapi.create_cookies(
-                user_id=data["user_id"], user_token=data["user_token"]
-            ),
-        ),
-        robot_ids=[data["robot_id"]],
+
+def parse_robot_ids(robot_ids: str) -> list[RobotId]:
+    """Split user input like "robot1, robot2" into robot ids"""
+    return [r for r in re.split(r"[\s,;]+", robot_ids) if r]
+
+
+async def async_list_robots(
+    hass: HomeAssistant,
+    user_id: str,
+    user_token: str,
+    robot_ids: list[RobotId],
+    refresh: bool = False,
+) -> dict[RobotId, echoroboticsapi.StatusInfo]:
+    """Look up robots of an account, using a single last_statuses() call for all of them.
+
+    Results are cached per user_id for ACCOUNT_LISTING_CACHE_TIME,
+    so the user step, retries and parallel flows for the same account
+    don't all hit echorobotics.com again.
+    Only robots not in the cache are requested.
+    With refresh, the cache is ignored, to find out whether the token still works.
+    """
+    token_hash = hashlib.sha256(user_token.encode()).hexdigest()
+    listings: dict[str, AccountListing] = hass.data.setdefault(
+        DATA_ACCOUNT_LISTINGS, {}
     )
-    try:
-        statuses = await api.last_statuses()
-    except aiohttp.ClientResponseError as e:
-        if e.status == 401:
-            raise InvalidAuth from e
-        else:
-            raise CannotConnect(e) from e
-    except Exception as exc:
-        raise CannotConnect(exc) from exc
+    listing = listings.get(user_id)
+    if (
+        refresh
+        or listing is None
+        or listing.token_hash != token_hash
+        or time.monotonic()
+        > listing.fetched + ACCOUNT_LISTING_CACHE_TIME.total_seconds()
+    ):
+        listing = listings[user_id] = AccountListing(token_hash, time.monotonic())
+
+    async with listing.lock:
+        # robot ids are matched case insensitively, echorobotics returns the canonical one
+        known = {r.lower(): r for r in listing.statuses}
+        missing = [r for r in robot_ids if r.lower() not in known]
+        if missing:
+            api = async_create_api(
+                hass, user_id=user_id, user_token=user_token, robot_ids=missing
+            )
+            try:
+                statuses = await api.last_statuses()
+            except aiohttp.ClientResponseError as e:
+                if e.status == 401:
+                    raise InvalidAuth from e
+                else:
+                    raise CannotConnect(e) from e
+            except Exception as exc:
+                raise CannotConnect(exc) from exc
+
+            if not statuses or not statuses.statuses_info:
+                _LOGGER.error(f"no statuses in {statuses}")
+                raise EmptyResponse()
+            for si in statuses.statuses_info:
+                listing.statuses[si.robot] = si
+                known[si.robot.lower()] = si.robot
+            if len(missing) == 1 and len(statuses.statuses_info) == 1:
+                known[missing[0].lower()] = statuses.statuses_info[0].robot
+
+    return {
+        known[r.lower()]: listing.statuses[known[r.lower()]]
+        for r in robot_ids
+        if r.lower() in known
+    }
 
-    if not statuses:
-        raise EmptyResponse()
-    if len(statuses.statuses_info) != 1:
-        _LOGGER.error(f"no statuses in {statuses}")
-        raise EmptyResponse()
 
-    if statuses.statuses_info[0].robot != data["robot_id"]:
-        data["robot_id"] = statuses.statuses_info[0].robot
+async def validate_input(
+    hass: HomeAssistant, data: dict[str, Any], refresh: bool = False
+) -> dict[str, Any]:
+    """Validate the user input allows us to connect.
+
+    Data has the keys user_id, user_token and robot_id.
+    refresh is passed to async_list_robots.
+    """
+    robots = await async_list_robots(
+        hass, data["user_id"], data["user_token"], [data["robot_id"]], refresh
+    )
+    if len(robots) != 1:
+        raise EmptyResponse()
 
+    data["robot_id"] = next(iter(robots))
     return data
 
 
@@ -72,10 +135,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 2
 
+    def __init__(self) -> None:
+        self._account: dict[str, str] = {}
+        self._robots: dict[RobotId, echoroboticsapi.StatusInfo] = {}
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Handle the initial step.
+
+        robot_id may contain several robot ids, they are all looked up at once.
+        The user then chooses which ones to add in async_step_robots.
+        """
 
         def get_default(key: str) -> str | None:
             if user_input:
@@ -94,11 +165,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_show_form(step_id="user", data_schema=user_data_schema)
 
         errors = {}
-        if await self.is_duplicate(user_input):
+        placeholders = {}
+        robot_ids = [
+            r
+            for r in parse_robot_ids(user_input["robot_id"])
+            if not self.is_duplicate(r)
+        ]
+        if not robot_ids:
             return self.async_abort(reason="already_configured")
 
         try:
-            user_input = await validate_input(self.hass, user_input)
+            robots = await async_list_robots(
+                self.hass, user_input["user_id"], user_input["user_token"], robot_ids
+            )
+            if not robots:
+                raise EmptyResponse()
         except CannotConnect:
             errors["base"] = "cannot_connect"
         except EmptyResponse:
@@ -109,18 +190,95 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception")
             errors["base"] = "unknown"
         else:
-            return self.async_create_entry(
-                title=user_input["robot_id"], data=user_input
-            )
+            # a single robot may come back under another id, see async_list_robots
+            found = {r.lower() for r in robots}
+            missing = [r for r in robot_ids if r.lower() not in found]
+            if missing and len(robots) < len(robot_ids):
+                errors["robot_id"] = "robots_not_found"
+                placeholders["missing"] = ", ".join(missing)
+
+        if not errors:
+            self._account = {
+                "user_id": user_input["user_id"],
+                "user_token": user_input["user_token"],
+            }
+            self._robots = {
+                r: si for r, si in robots.items() if not self.is_duplicate(r)
+            }
+            if not self._robots:
+                return self.async_abort(reason="already_configured")
+            if len(self._robots) == 1:
+                return await self._async_create_robot_entry(next(iter(self._robots)))
+            return await self.async_step_robots()
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=user_data_schema,
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def async_step_robots(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user select which of the found robots to add.
+
+        This flow creates the entry for the first one,
+        the others are added by import flows using the already validated data.
+        """
+        errors = {}
+        if user_input is not None:
+            selected: list[RobotId] = user_input["robot_ids"]
+            if selected:
+                return await self._async_create_robot_entries(selected)
+            errors["base"] = "no_robots_selected"
 
         return self.async_show_form(
-            step_id="user", data_schema=user_data_schema, errors=errors
+            step_id="robots",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        "robot_ids", default=list(self._robots)
+                    ): cv.multi_select(
+                        {r: f"{r} ({si.status})" for r, si in self._robots.items()}
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def _async_create_robot_entries(self, selected: list[RobotId]) -> FlowResult:
+        for robot_id in selected[1:]:
+            self.hass.async_create_task(
+                self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": config_entries.SOURCE_IMPORT},
+                    data={**self._account, "robot_id": robot_id},
+                )
+            )
+        return await self._async_create_robot_entry(selected[0])
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Add a robot selected in async_step_robots of another flow."""
+        robot_id = import_data["robot_id"]
+        await self.async_set_unique_id(robot_id.lower())
+        self._abort_if_unique_id_configured()
+        if self.is_duplicate(robot_id):
+            return self.async_abort(reason="already_configured")
+        return self.async_create_entry(title=robot_id, data=import_data)
+
+    async def _async_create_robot_entry(self, robot_id: RobotId) -> FlowResult:
+        """Create the entry of robot_id, with the robot as unique_id"""
+        await self.async_set_unique_id(robot_id.lower())
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=robot_id, data={**self._account, "robot_id": robot_id}
         )
 
-    async def is_duplicate(self, user_input) -> bool:
-        """Check if current device is already configured."""
+    def is_duplicate(self, robot_id: RobotId) -> bool:
+        """Check if a robot is already configured."""
         for other_robot in self._async_current_entries():
-            if other_robot.data["robot_id"] == user_input["robot_id"]:
+            if other_robot.data["robot_id"].lower() == robot_id.lower():
                 return True
         return False
 
@@ -135,7 +293,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             user_input["user_id"] = existing_entry.data["user_id"]
             user_input["robot_id"] = existing_entry.data["robot_id"]
             try:
-                user_input = await validate_input(self.hass, user_input)
+                # a cached listing would accept a revoked token
+                user_input = await validate_input(self.hass, user_input, refresh=True)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except EmptyResponse:
@@ -9,3 +9,41 @@ HISTORY_UPDATE_INTERVAL = 15 * 60
 RobotId = str
 UNAVAILABLE_TIMEOUT = timedelta(minutes=5)
 UNAVAILABLE_FETCHES = 2
+STORAGE_VERSION = 1
+MODE_TIMELINE_MAX_ENTRIES = 20
+MODE_TIMELINE_SAVE_DELAY = 10
+REQUEST_BUDGET_RATE = 1.0
+"""tokens per second, per account"""
+REQUEST_BUDGET_CAPACITY = 60
+DATA_BUDGETS = f"{DOMAIN}_budgets"
+DATA_ACCOUNT_LISTINGS = f"{DOMAIN}_account_listings"
+ACCOUNT_LISTING_CACHE_TIME = timedelta(minutes=5)
+PAYLOAD_BUFFER_MAX_ENTRIES = 50
+PAYLOAD_BUFFER_MAX_BYTES = 256 * 1024
+TRACE_FLUSH_ENTRIES = 100
+TRACE_DEFAULT_DURATION = timedelta(hours=1)
+REPLAY_TOLERANCE = 1
+"""seconds a replayed response may have been recorded after the virtual now"""
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+POLL_MIN_INTERVAL_FRACTION = 0.5
+POLL_STARTUP_STAGGER = timedelta(seconds=0.5)
+POLL_STARTUP_STAGGER_MAX = timedelta(seconds=10)
+DATA_PARSE_EXECUTOR = f"{DOMAIN}_parse_executor"
+PARSE_MAX_WORKERS = 2
+DATA_FLEETS = f"{DOMAIN}_fleets"
+PROFILE_DEFAULT_DURATION = timedelta(minutes=1)
+STUCK_WINDOW = timedelta(minutes=5)
+STUCK_MAX_SPREAD = 3
+"""meters"""
+STUCK_MIN_FIXES = 3
+EVENT_STUCK = f"{DOMAIN}_stuck"
+GETCONFIG_FINGERPRINT_SAVE_DELAY = 10
+TELEMETRY_MAX_SAMPLES = 10000
+"""per coordinator"""
+TELEMETRY_CHUNK_ROWS = 1000
+EVENT_ALARM = f"{DOMAIN}_alarm"
+ALARM_POLL_INTERVAL = timedelta(seconds=15)
+ALARM_POLL_MAX_DURATION = timedelta(minutes=10)
+TASK_GROUP_MAX_CONCURRENCY = 4
+TASK_SHUTDOWN_DEADLINE = timedelta(seconds=5)
+DATA_TASK_STATS = f"{DOMAIN}_task_stats"
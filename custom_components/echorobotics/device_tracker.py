@@ -6,7 +6,7 @@ from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 import echoroboticsapi
 
 from . import EchoRoboticsDataUpdateCoordinator
@@ -49,11 +49,6 @@ class EchoRoboticsLocation(EchoRoboticsBaseEntity, TrackerEntity):
         """Shorthand for internal use in this class"""
         return self.coordinator.get_status_info(self.robot_id)
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
-
     @property
     def longitude(self):
         if self.status_info:
@@ -0,0 +1,82 @@
+"""Diagnostics support for echorobotics."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import EchoRoboticsDataUpdateCoordinator
+from .const import DOMAIN
+
+TO_REDACT = {
+    "user_id",
+    "user_token",
+    "UserId",
+    "UserToken",
+    # the robot's serial number, also in the entry's title and unique_id
+    "robot_id",
+    "title",
+    "unique_id",
+    # in api payloads: position, mac address and serial numbers of the robots
+    "Position",
+    "Latitude",
+    "Longitude",
+    "MacAddress",
+    "SerialNumber",
+    "Robot",
+    "Robots",
+}
+
+
+def _redact_exchange(exchange: dict, robot_ids: list[str]) -> dict:
+    """Remove robot ids from the url, the payload is redacted with TO_REDACT"""
+    url = exchange["url"]
+    for robot_id in robot_ids:
+        url = url.replace(robot_id, REDACTED)
+    return {**exchange, "url": url}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Recent raw api responses are only decoded here, not when they are received.
+    """
+    coordinator: EchoRoboticsDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+
+    return async_redact_data(
+        {
+            "entry": entry.as_dict(),
+            "coordinator": {
+                "last_update_success": coordinator.last_update_success,
+                "fetch_fail_count": coordinator.fetch_fail_count,
+                "should_be_unavailable": coordinator._should_be_unavailable(),
+                "pending_mode": coordinator.pending_mode,
+                "alarm_robot_count": len(coordinator.alarm_robots),
+                "alarm_polling": coordinator.alarm_polling,
+                "guessed_mode": coordinator.smartmode.get_robot_mode(),
+                "guessed_mode_confidence": coordinator.mode_timeline.confidence,
+                "mode_timeline": [
+                    change._asdict() for change in coordinator.mode_timeline.changes
+                ],
+            },
+            "tasks": coordinator.tasks.as_dict(),
+            "request_budget": api.budget.as_dict(),
+            "request_stats": api.request_stats.as_dict(),
+            "parse_stats": api.parse_stats.as_dict(),
+            "payloads": {
+                "count": len(api.payloads),
+                "size": api.payloads.size,
+                "exchanges": [
+                    _redact_exchange(exchange, api.robot_ids)
+                    for exchange in api.payloads.as_list()
+                ],
+            },
+        },
+        TO_REDACT,
+    )
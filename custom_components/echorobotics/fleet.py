@@ -0,0 +1,139 @@
+"""Aggregates over all robots of an account
+
+Coordinators report per robot changes, FleetAggregate keeps counts and sums up to date
+from those, so an update costs O(changed robots) instead of O(fleet).
+The fleet sensors in sensor.py just read the results.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_FLEETS, RobotId
+
+RobotRecord = tuple[str | None, float | None]
+"""normalized status and battery of a robot, status None means unavailable"""
+
+
+class FleetAggregate:
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.owner_entry_id: str | None = None
+        """config entry that provides the fleet sensors"""
+
+        self._robots: dict[RobotId, RobotRecord] = {}
+        self.status_counts: Counter[str] = Counter()
+        self.unavailable: int = 0
+        self._battery_sum: float = 0
+        self._battery_count: int = 0
+        self._battery_min: float | None = None
+        self._battery_min_stale = False
+        self._changed = False
+        self._listeners: set[CALLBACK_TYPE] = set()
+
+    @property
+    def robot_count(self) -> int:
+        return len(self._robots)
+
+    @property
+    def battery_mean(self) -> float | None:
+        if not self._battery_count:
+            return None
+        return self._battery_sum / self._battery_count
+
+    @property
+    def battery_min(self) -> float | None:
+        """Only recomputed when the robot with the lowest battery went up or away"""
+        if self._battery_min_stale:
+            self._battery_min = min(
+                (
+                    b
+                    for s, b in self._robots.values()
+                    if s is not None and b is not None
+                ),
+                default=None,
+            )
+            self._battery_min_stale = False
+        return self._battery_min
+
+    def _add(self, record: RobotRecord) -> None:
+        status, battery = record
+        if status is None:
+            self.unavailable += 1
+            return
+        self.status_counts[status] += 1
+        if battery is not None:
+            self._battery_sum += battery
+            self._battery_count += 1
+            if not self._battery_min_stale and (
+                self._battery_min is None or battery < self._battery_min
+            ):
+                self._battery_min = battery
+
+    def _remove(self, record: RobotRecord) -> None:
+        status, battery = record
+        if status is None:
+            self.unavailable -= 1
+            return
+        self.status_counts[status] -= 1
+        if battery is not None:
+            self._battery_sum -= battery
+            self._battery_count -= 1
+            if battery == self._battery_min:
+                self._battery_min_stale = True
+
+    def update_robot(
+        self, robot_id: RobotId, status: str | None, battery: float | None
+    ) -> None:
+        record = (status, battery if status is not None else None)
+        old = self._robots.get(robot_id)
+        if old == record:
+            return
+        if old is not None:
+            self._remove(old)
+        self._robots[robot_id] = record
+        self._add(record)
+        self._changed = True
+
+    def remove_robot(self, robot_id: RobotId) -> None:
+        old = self._robots.pop(robot_id, None)
+        if old is not None:
+            self._remove(old)
+            self._changed = True
+
+    @callback
+    def async_commit(self) -> None:
+        """Notify listeners, if anything changed since the last commit"""
+        if not self._changed:
+            return
+        self._changed = False
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        self._listeners.add(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.discard(update_callback)
+
+        return remove_listener
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant, user_id: str) -> FleetAggregate:
+    """Get the FleetAggregate of an account, shared between config entries"""
+    fleets: dict[str, FleetAggregate] = hass.data.setdefault(DATA_FLEETS, {})
+    if user_id not in fleets:
+        fleets[user_id] = FleetAggregate(user_id)
+    return fleets[user_id]
+
+
+@callback
+def async_remove_fleet(hass: HomeAssistant, user_id: str) -> None:
+    """Forget the FleetAggregate of an account, once none of its entries is loaded"""
+    hass.data.get(DATA_FLEETS, {}).pop(user_id, None)
@@ -17,6 +17,7 @@ import echoroboticsapi
 from . import EchoRoboticsDataUpdateCoordinator
 from .const import DOMAIN, RobotId
 from .base import EchoRoboticsBaseEntity
+from .status_table import MODE_TABLE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,33 +52,14 @@ class EchoRoboticsLawnMowerEntity(EchoRoboticsBaseEntity, LawnMowerEntity):
         self._attr_unique_id = f"{robot_id}-lawn-mower"
 
     @property
-    def activity(self) -> LawnMowerActivity:
-        coord: EchoRoboticsDataUpdateCoordinator = self.coordinator
-
+    def activity(self) -> LawnMowerActivity | None:
         if self.pending_mode is not None:
-            if self.pending_mode in ["work"]:
-                return LawnMowerActivity.MOWING
-            if self.pending_mode in ["chargeAndWork", "chargeAndStay"]:
-                return LawnMowerActivity.DOCKED
+            mode = MODE_TABLE.get(self.pending_mode)
+            if mode is not None:
+                return mode.activity
 
-        match self.status_info.status:
-            case "Offline" | "Alarm" | "Warning" | "OffAfterAlarm":
-                return LawnMowerActivity.ERROR
-            case "Idle" | "WaitStation" | "Charge" | "Off":
-                return LawnMowerActivity.DOCKED
-            case (
-                "GoUnloadStation"
-                | "GoChargeStation"
-                | "Work"
-                | "LeaveStation"
-                | "GoStation"
-                | "Border"
-                | "BorderCheck"
-                | "BorderDiscovery"
-            ):
-                return LawnMowerActivity.MOWING
-            case other:
-                raise ValueError(f"unexpected status: {other}")
+        record = self.coordinator.get_status_record(self.robot_id)
+        return None if record is None else record.activity
 
     async def async_start_mowing(self) -> None:
         """Resume schedule."""
@@ -0,0 +1,185 @@
+"""Prometheus text exposition of all loaded robots, at /api/echorobotics/metrics
+
+Rendered straight from coordinator state, without going through the state machine.
+Label strings are built once per coordinator and reused on every scrape.
+Metrics of a config entry, like its api requests, are labelled with entry_id,
+metrics of a robot with robot_id.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import time
+from typing import TYPE_CHECKING
+import weakref
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, RobotId
+
+if TYPE_CHECKING:
+    from . import EchoRoboticsDataUpdateCoordinator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _header(name: str, metric_type: str, help_text: str) -> str:
+    return f"# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n"
+
+
+HEADER_UP = _header(
+    "echorobotics_up", "gauge", "0 while the entities of a config entry are unavailable"
+)
+HEADER_FETCH_FAIL_COUNT = _header(
+    "echorobotics_fetch_fail_count", "gauge", "Failed refreshes since the last success"
+)
+HEADER_PENDING_MODE = _header(
+    "echorobotics_pending_mode", "gauge", "1 for a mode change not confirmed yet"
+)
+HEADER_REQUESTS = _header(
+    "echorobotics_api_requests_total", "counter", "Requests to echorobotics.com"
+)
+HEADER_REQUEST_FAILURES = _header(
+    "echorobotics_api_request_failures_total",
+    "counter",
+    "Requests to echorobotics.com that failed",
+)
+HEADER_REQUEST_DURATION = _header(
+    "echorobotics_api_request_duration_seconds_total",
+    "counter",
+    "Time spent waiting for echorobotics.com",
+)
+HEADER_STATUS = _header(
+    "echorobotics_status", "gauge", "1 for the current status of a robot"
+)
+HEADER_ONLINE = _header("echorobotics_online", "gauge", "Whether a robot is online")
+HEADER_BATTERY = _header(
+    "echorobotics_battery_percent", "gauge", "Estimated battery level of a robot"
+)
+HEADER_POSITION_AGE = _header(
+    "echorobotics_position_age_seconds",
+    "gauge",
+    "Time since a robot last reported its position",
+)
+
+
+class _Labels:
+    """Label strings of a coordinator and its robots"""
+
+    def __init__(self, coordinator: EchoRoboticsDataUpdateCoordinator):
+        self.entry = f'{{entry_id="{_escape(coordinator.config_entry.entry_id)}"}}'
+        self.robots = {
+            robot_id: f'{{robot_id="{_escape(robot_id)}"}}'
+            for robot_id in coordinator.api.robot_ids
+        }
+        self._status: dict[tuple[RobotId, str], str] = {}
+        self._pending_mode: dict[str, str] = {}
+
+    def status(self, robot_id: RobotId, status: str) -> str:
+        key = (robot_id, status)
+        if key not in self._status:
+            self._status[
+                key
+            ] = f'{{robot_id="{_escape(robot_id)}",status="{_escape(status)}"}}'
+        return self._status[key]
+
+    def pending_mode(self, mode: str) -> str:
+        if mode not in self._pending_mode:
+            self._pending_mode[mode] = f'{self.entry[:-1]},mode="{_escape(mode)}"}}'
+        return self._pending_mode[mode]
+
+
+def render_metrics(
+    coordinators: Iterable[tuple[EchoRoboticsDataUpdateCoordinator, _Labels]],
+    now: float,
+) -> str:
+    """now is the current unix time, for position ages"""
+    coordinators = list(coordinators)
+    out: list[str] = []
+    w = out.append
+
+    w(HEADER_UP)
+    for c, labels in coordinators:
+        w(f"echorobotics_up{labels.entry} {0 if c._should_be_unavailable() else 1}\n")
+    w(HEADER_FETCH_FAIL_COUNT)
+    for c, labels in coordinators:
+        w(f"echorobotics_fetch_fail_count{labels.entry} {c.fetch_fail_count}\n")
+    w(HEADER_PENDING_MODE)
+    for c, labels in coordinators:
+        if c.pending_mode is not None:
+            w(f"echorobotics_pending_mode{labels.pending_mode(c.pending_mode)} 1\n")
+    w(HEADER_REQUESTS)
+    for c, labels in coordinators:
+        w(
+            f"echorobotics_api_requests_total{labels.entry} "
+            f"{c.api.request_stats.count}\n"
+        )
+    w(HEADER_REQUEST_FAILURES)
+    for c, labels in coordinators:
+        w(
+            f"echorobotics_api_request_failures_total{labels.entry} "
+            f"{c.api.request_stats.failures}\n"
+        )
+    w(HEADER_REQUEST_DURATION)
+    for c, labels in coordinators:
+        w(
+            f"echorobotics_api_request_duration_seconds_total{labels.entry} "
+            f"{c.api.request_stats.duration:.6f}\n"
+        )
+
+    robots = [
+        (robot_id, label, si, labels)
+        for c, labels in coordinators
+        if not c._should_be_unavailable()
+        for robot_id, label in labels.robots.items()
+        if (si := c.get_status_info(robot_id)) is not None
+    ]
+    w(HEADER_STATUS)
+    for robot_id, _label, si, labels in robots:
+        w(f"echorobotics_status{labels.status(robot_id, si.status)} 1\n")
+    w(HEADER_ONLINE)
+    for _robot_id, label, si, _labels in robots:
+        w(f"echorobotics_online{label} {int(si.is_online)}\n")
+    w(HEADER_BATTERY)
+    for _robot_id, label, si, _labels in robots:
+        w(f"echorobotics_battery_percent{label} {si.estimated_battery_level}\n")
+    w(HEADER_POSITION_AGE)
+    for _robot_id, label, si, _labels in robots:
+        age = now - si.position.date_time.timestamp()
+        w(f"echorobotics_position_age_seconds{label} {age:.0f}\n")
+
+    return "".join(out)
+
+
+class EchoRoboticsMetricsView(HomeAssistantView):
+    """Serves render_metrics() for all loaded config entries"""
+
+    url = "/api/echorobotics/metrics"
+    name = "api:echorobotics:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._labels: weakref.WeakKeyDictionary[
+            EchoRoboticsDataUpdateCoordinator, _Labels
+        ] = weakref.WeakKeyDictionary()
+
+    def _labelled(
+        self,
+    ) -> Iterable[tuple[EchoRoboticsDataUpdateCoordinator, _Labels]]:
+        for coordinator in self.hass.data.get(DOMAIN, {}).values():
+            labels = self._labels.get(coordinator)
+            if labels is None:
+                labels = self._labels[coordinator] = _Labels(coordinator)
+            yield coordinator, labels
+
+    async def get(self, request: web.Request) -> web.Response:
+        body = render_metrics(self._labelled(), time.time())
+        return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
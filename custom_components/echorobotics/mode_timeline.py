@@ -0,0 +1,157 @@
+"""Persisted timeline of robot mode changes.
+
+echorobotics doesn't tell us which mode a robot is in, SmartMode has to guess it.
+That guess lives in memory only, so after a restart it is gone until SmartMode
+has seen enough statuses or history again.
+
+ModeTimeline keeps a short list of mode changes we are fairly sure about
+and stores it using homeassistant's storage helper.
+At startup, SmartMode is seeded from the newest entry.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import NamedTuple
+
+import echoroboticsapi
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    RobotId,
+    STORAGE_VERSION,
+    MODE_TIMELINE_MAX_ENTRIES,
+    MODE_TIMELINE_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+MODE_SOURCE_SET_MODE = "set_mode"
+"""mode was set by us and api.set_mode verified it"""
+MODE_SOURCE_OBSERVED = "observed"
+"""SmartMode inferred the mode from statuses or history"""
+
+CONFIDENCE_CONFIRMED = "confirmed"
+CONFIDENCE_OBSERVED = "observed"
+CONFIDENCE_RESTORED = "restored"
+CONFIDENCE_UNKNOWN = "unknown"
+
+
+class ModeChange(NamedTuple):
+    tstamp: float
+    """wall clock time (time.time()) of the change"""
+    mode: echoroboticsapi.Mode
+    source: str
+
+
+class ModeTimeline:
+    """Compact, persisted list of mode changes for one robot"""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, robot_id: RobotId):
+        self.robot_id = robot_id
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.mode_timeline"
+        )
+        self._changes: list[ModeChange] = []
+        self._restored: bool = False
+
+    @property
+    def changes(self) -> list[ModeChange]:
+        return self._changes
+
+    @property
+    def latest(self) -> ModeChange | None:
+        return self._changes[-1] if self._changes else None
+
+    @property
+    def confidence(self) -> str:
+        """How much we trust the newest entry
+
+        confirmed: set by us and verified by the api
+        observed: inferred by SmartMode while we were running
+        restored: loaded from storage, no new mode change since startup
+        unknown: no entries at all
+        """
+        latest = self.latest
+        if latest is None:
+            return CONFIDENCE_UNKNOWN
+        if self._restored:
+            return CONFIDENCE_RESTORED
+        if latest.source == MODE_SOURCE_SET_MODE:
+            return CONFIDENCE_CONFIRMED
+        return CONFIDENCE_OBSERVED
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if not data or data.get("robot_id") != self.robot_id:
+            return
+        try:
+            self._changes = [ModeChange(*change) for change in data["changes"]]
+        except (KeyError, TypeError) as e:
+            _LOGGER.warning("ignoring invalid mode timeline %s", data, exc_info=e)
+            self._changes = []
+            return
+        self._restored = bool(self._changes)
+        _LOGGER.debug("restored mode timeline %s", self._changes)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def seed_smart_mode(self, smartmode: echoroboticsapi.SmartMode) -> None:
+        """Make smartmode start out with the newest known mode
+
+        SmartMode has no public setter that keeps the original timestamp.
+        The timestamp matters, because SmartMode only accepts history events newer than it.
+        """
+        latest = self.latest
+        if latest is None or smartmode.get_robot_mode() is not None:
+            return
+        smartmode._last_known_mode = latest.mode
+        smartmode._mode_known_since = latest.tstamp
+        _LOGGER.debug("seeded smartmode with %s", latest)
+
+    @callback
+    def async_record(
+        self,
+        mode: echoroboticsapi.Mode | None,
+        source: str,
+        tstamp: float | None = None,
+    ) -> None:
+        """Add a mode change, if mode differs from the newest entry
+
+        A set_mode confirmation of the mode we already observed upgrades that entry,
+        as SmartMode may already know about a successful set_mode before we do.
+        """
+        if mode is None:
+            return
+        latest = self.latest
+        if latest is not None and latest.mode == mode:
+            # observing the same mode again tells us nothing,
+            # SmartMode keeps reporting the mode it was seeded with
+            if source == MODE_SOURCE_SET_MODE:
+                self._restored = False
+                if latest.source != source:
+                    self._changes[-1] = latest._replace(source=source)
+                    self._async_schedule_save()
+            return
+
+        self._restored = False
+        self._changes.append(ModeChange(tstamp or time.time(), mode, source))
+        del self._changes[:-MODE_TIMELINE_MAX_ENTRIES]
+        _LOGGER.debug("recorded mode change %s", self._changes[-1])
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, MODE_TIMELINE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {
+            "robot_id": self.robot_id,
+            "changes": [list(change) for change in self._changes],
+        }
@@ -0,0 +1,63 @@
+"""Spread polls of all coordinators evenly over UPDATE_INTERVAL
+
+Without this, all coordinators start polling when homeassistant starts,
+and keep polling at the same moment every UPDATE_INTERVAL after that.
+
+Each coordinator gets a phase within the interval, hashed from its robot ids.
+Phases are relative to the wall clock, so they are stable across restarts.
+The coordinator asks for the delay to its next phase at the end of every refresh,
+which also realigns it after manual refreshes.
+The first refreshes at startup are spread out as well.
+"""
+
+from __future__ import annotations
+
+import random
+import zlib
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_POLL_SCHEDULER,
+    UPDATE_INTERVAL,
+    POLL_MIN_INTERVAL_FRACTION,
+    POLL_STARTUP_STAGGER,
+    POLL_STARTUP_STAGGER_MAX,
+)
+
+
+class PollScheduler:
+    def __init__(self, interval: float):
+        """interval is in seconds"""
+        self.interval = interval
+        self._startup_slots: int = 0
+
+    def phase(self, key: str) -> float:
+        """Offset of key's polls within the interval, in seconds"""
+        return zlib.crc32(key.encode()) / 2**32 * self.interval
+
+    def next_delay(self, key: str, now: float) -> float:
+        """Seconds from now (wall clock, time.time()) until key's next phase
+
+        Never less than POLL_MIN_INTERVAL_FRACTION of the interval,
+        so realigning never causes two polls in quick succession.
+        """
+        delay = (self.phase(key) - now) % self.interval
+        if delay < self.interval * POLL_MIN_INTERVAL_FRACTION:
+            delay += self.interval
+        return delay
+
+    def startup_delay(self) -> float:
+        """Seconds to wait before the first refresh, a new slot for every caller"""
+        stagger = POLL_STARTUP_STAGGER.total_seconds()
+        slot = self._startup_slots
+        self._startup_slots += 1
+        delay = slot * stagger % POLL_STARTUP_STAGGER_MAX.total_seconds()
+        return delay + random.uniform(0, stagger)
+
+
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> PollScheduler:
+    if DATA_POLL_SCHEDULER not in hass.data:
+        hass.data[DATA_POLL_SCHEDULER] = PollScheduler(UPDATE_INTERVAL.total_seconds())
+    return hass.data[DATA_POLL_SCHEDULER]
@@ -0,0 +1,82 @@
+"""cProfile restricted to the integration's own work, for the profile service
+
+The profiler is only enabled while a coordinator refresh is actually running,
+not while it awaits the api, and while entities handle coordinator updates.
+So the stats show what the integration costs on the event loop,
+not whatever else homeassistant runs at the same time.
+
+Responses are parsed in the parse executor (see api.py), which cProfile doesn't follow;
+ParseStats covers that time instead.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Coroutine
+import cProfile
+import logging
+import types
+from typing import Any, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class IntegrationProfiler:
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+        self.active = True
+        """False once the profiling window is over, or the profiler failed to start"""
+        self._depth = 0
+        self._enabled = False
+
+    def _enter(self) -> None:
+        self._depth += 1
+        if self._depth == 1 and self.active:
+            try:
+                self.profile.enable()
+            except ValueError:
+                # another profiler is running, like homeassistant's profiler
+                _LOGGER.warning("can't profile, another profiler is active")
+                self.active = False
+                return
+            self._enabled = True
+
+    def _exit(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._enabled:
+            self.profile.disable()
+            self._enabled = False
+
+    def runcall(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Call func(*args), profiled"""
+        self._enter()
+        try:
+            return func(*args)
+        finally:
+            self._exit()
+
+    def profile_coroutine(self, coro: Coroutine[Any, Any, _T]) -> Awaitable[_T]:
+        """Await coro, profiling each of its steps, but not the time it is suspended"""
+        return self._stepped(coro)
+
+    @types.coroutine
+    def _stepped(self, coro: Coroutine[Any, Any, _T]):
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            self._enter()
+            try:
+                if error is None:
+                    future = coro.send(value)
+                else:
+                    future = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._exit()
+            try:
+                value, error = (yield future), None
+            except BaseException as e:  # pylint: disable=broad-except
+                # cancellation and such, passed on into coro
+                value, error = None, e
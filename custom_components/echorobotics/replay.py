@@ -0,0 +1,280 @@
+"""Replay a trace recorded by the record_trace service, without access to echorobotics.com
+
+Meant for development, see hacking.md.
+TraceReplaySession stands in for the aiohttp session of an EchoRoboticsApi,
+answering requests with the recorded responses.
+async_replay_trace() then drives a coordinator through all recorded polls,
+using a virtual clock, as fast as possible or at a chosen speedup.
+Waiting inside a poll, like for a getconfig reload, still takes real time.
+Like in a real poll, the entities of robots whose data changed are updated,
+as are listeners without a robot.
+
+echoroboticsapi's SmartFetch and SmartMode decide when to fetch the history and
+which mode the robot is in from time.time(). While replaying, their modules get
+a time that follows the virtual clock, starting at the trace's start, and the
+coordinator gets a fresh SmartMode and SmartFetch state. This affects all
+coordinators, replaying is for development only.
+
+set_mode calls are not replayed, but their current() responses are part of the trace.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+import sys
+import time
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import echoroboticsapi
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from homeassistant.util.json import json_loads
+
+from .api_trace import ApiExchange, FAILED_EXCHANGE_STATUS
+from .budget import RequestBudget
+from .const import REPLAY_TOLERANCE
+
+if TYPE_CHECKING:
+    from . import EchoRoboticsDataUpdateCoordinator
+
+
+class ReplayClock:
+    """Virtual monotonic clock
+
+    now is the offset into the trace, plus the real time passed since it was set,
+    so waiting within a poll (like for getconfig) takes as long as when recorded.
+    """
+
+    def __init__(self) -> None:
+        self.offset: float = 0
+        self._base = self._set_at = time.monotonic()
+
+    def set(self, offset: float) -> None:
+        self.offset = offset
+        self._set_at = time.monotonic()
+
+    @property
+    def now(self) -> float:
+        return self.offset + time.monotonic() - self._set_at
+
+    def monotonic(self) -> float:
+        return self._base + self.now
+
+
+class ReplayTime:
+    """Stands in for the time module of echoroboticsapi's SmartFetch and SmartMode
+
+    time() is the wall clock time of the recording at the clock's now.
+    """
+
+    def __init__(self, clock: ReplayClock, started: float):
+        self._clock = clock
+        self._started = started
+
+    def time(self) -> float:
+        return self._started + self._clock.now
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(time, name)
+
+
+class ReplayResponse:
+    """Just enough of aiohttp.ClientResponse for echoroboticsapi"""
+
+    def __init__(self, exchange: ApiExchange):
+        self.status = exchange.status
+        self.url = URL(exchange.url)
+        self.method = exchange.method
+        self._body = exchange.body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self, **kwargs: Any) -> Any:
+        return json_loads(self._body)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(
+                    self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url
+                ),
+                (),
+                status=self.status,
+                message="replayed",
+            )
+
+
+_TIME_QUERY_PARAMS = frozenset({"DateFrom", "DateTo"})
+"""history_list asks for a range around now, which is different when replaying"""
+
+RequestKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+def _request_key(method: str, url: str | URL) -> RequestKey:
+    """Method, path and query of a request, leaving out _TIME_QUERY_PARAMS"""
+    url = URL(url)
+    query = tuple(
+        sorted((k, v) for k, v in url.query.items() if k not in _TIME_QUERY_PARAMS)
+    )
+    return method, url.path, query
+
+
+class TraceReplaySession:
+    """Answers requests with recorded responses for the same request
+
+    Requests are matched by method, path and query, except for _TIME_QUERY_PARAMS.
+    Per request, the responses recorded up to the clock's now are served
+    one after the other, in recorded order. Responses recorded later are not served
+    yet, when there are none left the last one is served again.
+    Responses recorded before the current poll, which the replay didn't ask for,
+    are skipped.
+    Failed exchanges raise the error they were recorded with.
+    """
+
+    def __init__(self, exchanges: list[ApiExchange], clock: ReplayClock):
+        self.clock = clock
+        self._queues: dict[RequestKey, deque[ApiExchange]] = defaultdict(deque)
+        for exchange in exchanges:
+            self._queues[_request_key(exchange.method, exchange.url)].append(exchange)
+        self._last: dict[RequestKey, ApiExchange] = {}
+        self.misses: int = 0
+        self.skipped: int = 0
+
+    async def request(self, method: str, url: URL, **kwargs: Any) -> ReplayResponse:
+        key = _request_key(method, url)
+        queue = self._queues.get(key)
+        poll_start = self.clock.offset - REPLAY_TOLERANCE
+        now = self.clock.now + REPLAY_TOLERANCE
+        if queue:
+            while queue and queue[0].tstamp < poll_start:
+                self._last[key] = queue.popleft()
+                self.skipped += 1
+            if queue and queue[0].tstamp <= now:
+                self._last[key] = queue.popleft()
+
+        exchange = self._last.get(key)
+        if exchange is None:
+            self.misses += 1
+            raise aiohttp.ClientConnectionError(f"nothing recorded for {method} {url}")
+        if exchange.status == FAILED_EXCHANGE_STATUS:
+            if exchange.body.decode() in ("TimeoutError", "CancelledError"):
+                raise asyncio.TimeoutError()
+            raise aiohttp.ClientConnectionError(exchange.body.decode())
+        return ReplayResponse(exchange)
+
+
+@dataclass
+class ReplayPoll:
+    offset: float
+    cpu_time: float
+    last_update_success: bool
+    should_be_unavailable: bool
+    fetch_fail_count: int
+
+
+@dataclass
+class ReplayReport:
+    polls: list[ReplayPoll] = field(default_factory=list)
+    misses: int = 0
+    skipped: int = 0
+    """recorded responses the replay didn't ask for"""
+
+    @property
+    def cpu_time(self) -> float:
+        return sum(p.cpu_time for p in self.polls)
+
+    @property
+    def availability_changes(self) -> int:
+        return sum(
+            1
+            for a, b in zip(self.polls, self.polls[1:])
+            if a.should_be_unavailable != b.should_be_unavailable
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "polls": len(self.polls),
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "cpu_time": self.cpu_time,
+            "max_cpu_time": max((p.cpu_time for p in self.polls), default=0),
+            "availability_changes": self.availability_changes,
+            "unavailable_polls": sum(p.should_be_unavailable for p in self.polls),
+        }
+
+
+def _poll_offsets(exchanges: list[ApiExchange]) -> list[float]:
+    """Every coordinator refresh does exactly one last_statuses call"""
+    return [e.tstamp for e in exchanges if e.url.endswith("/LastStatuses")]
+
+
+async def async_replay_trace(
+    coordinator: EchoRoboticsDataUpdateCoordinator,
+    exchanges: list[ApiExchange],
+    speed: float | None = None,
+    started: float | None = None,
+) -> ReplayReport:
+    """Refresh coordinator once per recorded poll, answering from exchanges
+
+    exchanges as returned by api_trace.read_trace(),
+    started is the header's "started", otherwise replaying starts at the real now.
+    With speed None, polls follow each other immediately,
+    otherwise the recorded time between them is divided by speed.
+    The coordinator's api, SmartMode and SmartFetch state are restored afterwards.
+    """
+    api = coordinator.api
+    clock = ReplayClock()
+    session = TraceReplaySession(exchanges, clock)
+    report = ReplayReport()
+    replay_time = ReplayTime(clock, time.time() if started is None else started)
+    smartmode = coordinator.smartmode
+    smartfetch = coordinator.smartfetch
+    library_modules: list[ModuleType] = [
+        sys.modules[type(smartmode).__module__],
+        sys.modules[type(smartfetch).__module__],
+    ]
+
+    saved = api.websession, api.budget, coordinator.monotonic
+    saved_fetch_history_times = smartfetch.fetch_history_times
+    saved_time = [module.time for module in library_modules]
+    api.websession = session
+    api.budget = RequestBudget(rate=1e9, capacity=2**31)
+    coordinator.monotonic = clock.monotonic
+    # mode and history schedule were computed with the real time, start over
+    coordinator.smartmode = echoroboticsapi.SmartMode(smartmode.robot_id)
+    api.register_smart_mode(coordinator.smartmode)
+    smartfetch.fetch_history_times = {}
+    for module in library_modules:
+        module.time = replay_time
+    try:
+        for offset in _poll_offsets(exchanges):
+            if speed is not None:
+                await asyncio.sleep((offset - clock.offset) / speed)
+            clock.set(offset)
+            start = time.process_time()
+            await coordinator.async_refresh()
+            report.polls.append(
+                ReplayPoll(
+                    offset,
+                    time.process_time() - start,
+                    coordinator.last_update_success,
+                    coordinator._should_be_unavailable(),
+                    coordinator.fetch_fail_count,
+                )
+            )
+    finally:
+        api.websession, api.budget, coordinator.monotonic = saved
+        coordinator.smartmode = smartmode
+        api.register_smart_mode(smartmode)
+        smartfetch.fetch_history_times = saved_fetch_history_times
+        for module, saved_module_time in zip(library_modules, saved_time):
+            module.time = saved_module_time
+    report.misses = session.misses
+    report.skipped = session.skipped
+    return report
@@ -15,11 +15,14 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
 )
 
 from . import EchoRoboticsDataUpdateCoordinator
 from .const import DOMAIN, RobotId
 from .base import EchoRoboticsBaseEntity
+from .fleet import FleetAggregate
+from .status_table import STATUS_OPTIONS
 
 
 async def async_setup_entry(
@@ -36,9 +39,37 @@ async def async_setup_entry(
                 robot_id=entry.data["robot_id"],
                 coordinator=coordinator,
             ),
+            EchoRoboticsRequestBudgetSensor(
+                robot_id=entry.data["robot_id"],
+                coordinator=coordinator,
+            ),
         ]
     )
 
+    fleet: FleetAggregate = coordinator.fleet
+
+    @callback
+    def async_add_fleet_sensors() -> None:
+        async_add_entities(
+            [
+                *(
+                    EchoRoboticsFleetStateCountSensor(fleet, normalized)
+                    for normalized in STATUS_OPTIONS
+                ),
+                EchoRoboticsFleetUnavailableSensor(fleet),
+                EchoRoboticsFleetBatteryMinSensor(fleet),
+                EchoRoboticsFleetBatteryMeanSensor(fleet),
+            ]
+        )
+
+    # one set of fleet sensors per account, no matter how many entries it has,
+    # claimed by the first entry getting here, which means its setup succeeded
+    coordinator.async_add_fleet_sensors = async_add_fleet_sensors
+    if fleet.owner_entry_id is None:
+        fleet.owner_entry_id = entry.entry_id
+    if fleet.owner_entry_id == entry.entry_id:
+        async_add_fleet_sensors()
+
 
 class EchoRoboticsSensor(EchoRoboticsBaseEntity, SensorEntity):
     """Sensor reporting the current state of the robot"""
@@ -58,26 +89,6 @@ class EchoRoboticsSensor(EchoRoboticsBaseEntity, SensorEntity):
 
 
 class EchoRoboticsStateSensor(EchoRoboticsSensor):
-    NORMALIZE_CASE = {
-        "Offline": "offline",
-        "Alarm": "alarm",
-        "Idle": "idle",
-        "WaitStation": "wait_station",
-        "Charge": "charge",
-        "GoUnloadStation": "go_unload_station",
-        "GoChargeStation": "go_charge_station",
-        "Work": "work",
-        "LeaveStation": "leave_station",
-        "Off": "off",
-        "GoStation": "go_station",
-        "Unknown": "unknown",
-        "Warning": "warning",
-        "Border": "border",
-        "BorderCheck": "border_check",
-        "BorderDiscovery": "border_discovery",
-        "OffAfterAlarm": "off_after_alarm",
-    }
-
     def __init__(
         self, robot_id: RobotId, coordinator: EchoRoboticsDataUpdateCoordinator
     ):
@@ -87,18 +98,12 @@ class EchoRoboticsStateSensor(EchoRoboticsSensor):
         self._attr_state_class = None
         self._attr_translation_key = "state_sensor"
         self._attr_device_class = SensorDeviceClass.ENUM
-
-    @property
-    def options(self) -> list[str] | None:
-        return list(self.NORMALIZE_CASE.values())
+        self._attr_options = STATUS_OPTIONS
 
     def _read_coordinator_data(self) -> None:
         super()._read_coordinator_data()
-        si = self.status_info
-        if si is None:
-            self._attr_native_value = None
-        else:
-            self._attr_native_value = self.NORMALIZE_CASE.get(si.status, si.status)
+        record = self.coordinator.get_status_record(self.robot_id)
+        self._attr_native_value = None if record is None else record.normalized
 
 
 class EchoRoboticsBatterySensor(EchoRoboticsSensor):
@@ -121,3 +126,124 @@ class EchoRoboticsBatterySensor(EchoRoboticsSensor):
             self._attr_native_value = None
         else:
             self._attr_native_value = round(si.estimated_battery_level, ndigits=1)
+
+
+class EchoRoboticsRequestBudgetSensor(EchoRoboticsSensor):
+    """How much of the account's request budget is used up"""
+
+    def __init__(
+        self, robot_id: RobotId, coordinator: EchoRoboticsDataUpdateCoordinator
+    ):
+        super().__init__(robot_id, coordinator)
+        # budget usage changes with every refresh, not only with our robot's data
+        self.coordinator_context = None
+        self._attr_unique_id = f"{robot_id}-request-budget"
+        self._attr_icon = "mdi:speedometer"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_translation_key = "request_budget"
+        self._attr_suggested_display_precision = 0
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def _read_coordinator_data(self) -> None:
+        super()._read_coordinator_data()
+        budget = self.coordinator.api.budget
+        self._attr_native_value = round(budget.usage, ndigits=1)
+        self._attr_extra_state_attributes = budget.as_dict()
+
+
+class EchoRoboticsFleetSensor(SensorEntity):
+    """Sensor over all robots of an account, updated by its FleetAggregate"""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, fleet: FleetAggregate, key: str) -> None:
+        self.fleet = fleet
+        self._attr_unique_id = f"{fleet.user_id}-fleet-{key}"
+        self._attr_device_info = DeviceInfo(
+            name="Echorobotics fleet",
+            identifiers={(DOMAIN, f"account-{fleet.user_id}")},
+            entry_type=None,
+            manufacturer="Echorobotics",
+        )
+        self._read_fleet()
+
+    @property
+    def attribution(self):
+        return "echorobotics.com"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.fleet.async_add_listener(self._handle_fleet_update))
+
+    @callback
+    def _handle_fleet_update(self) -> None:
+        self._read_fleet()
+        self.async_write_ha_state()
+
+    def _read_fleet(self) -> None:
+        pass
+
+
+class EchoRoboticsFleetStateCountSensor(EchoRoboticsFleetSensor):
+    """Number of robots in one state"""
+
+    ENABLED_BY_DEFAULT = {"work", "alarm", "warning", "offline"}
+
+    def __init__(self, fleet: FleetAggregate, normalized: str) -> None:
+        self.normalized = normalized
+        super().__init__(fleet, f"state-{normalized}")
+        self._attr_icon = "mdi:robot-mower"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_translation_key = f"fleet_{normalized}"
+        self._attr_entity_registry_enabled_default = (
+            normalized in self.ENABLED_BY_DEFAULT
+        )
+
+    def _read_fleet(self) -> None:
+        self._attr_native_value = self.fleet.status_counts[self.normalized]
+
+
+class EchoRoboticsFleetUnavailableSensor(EchoRoboticsFleetSensor):
+    def __init__(self, fleet: FleetAggregate) -> None:
+        super().__init__(fleet, "unavailable")
+        self._attr_icon = "mdi:robot-off"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_translation_key = "fleet_unavailable"
+
+    def _read_fleet(self) -> None:
+        self._attr_native_value = self.fleet.unavailable
+        self._attr_extra_state_attributes = {"robots": self.fleet.robot_count}
+
+
+class EchoRoboticsFleetBatteryMinSensor(EchoRoboticsFleetSensor):
+    def __init__(self, fleet: FleetAggregate) -> None:
+        super().__init__(fleet, "battery-min")
+        self._attr_device_class = SensorDeviceClass.BATTERY
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_translation_key = "fleet_battery_min"
+        self._attr_suggested_display_precision = 1
+
+    def _read_fleet(self) -> None:
+        battery = self.fleet.battery_min
+        self._attr_native_value = None if battery is None else round(battery, ndigits=1)
+
+
+class EchoRoboticsFleetBatteryMeanSensor(EchoRoboticsFleetSensor):
+    def __init__(self, fleet: FleetAggregate) -> None:
+        super().__init__(fleet, "battery-mean")
+        self._attr_device_class = SensorDeviceClass.BATTERY
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_translation_key = "fleet_battery_mean"
+        self._attr_suggested_display_precision = 1
+
+    def _read_fleet(self) -> None:
+        battery = self.fleet.battery_mean
+        self._attr_native_value = None if battery is None else round(battery, ndigits=1)
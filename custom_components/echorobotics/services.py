@@ -0,0 +1,172 @@
+"""Services of the echorobotics integration"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from itertools import chain
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import async_call_later
+import homeassistant.helpers.config_validation as cv
+
+from .api_trace import TraceRecorder
+from .const import DOMAIN, TRACE_DEFAULT_DURATION, PROFILE_DEFAULT_DURATION
+from .profiler import IntegrationProfiler
+from .telemetry import (
+    FORMATS,
+    FORMAT_CSV,
+    FORMAT_PARQUET,
+    parquet_available,
+    write_csv,
+    write_parquet,
+)
+
+if TYPE_CHECKING:
+    from . import EchoRoboticsDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_RECORD_TRACE = "record_trace"
+SERVICE_PROFILE = "profile"
+SERVICE_EXPORT_TELEMETRY = "export_telemetry"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_FORMAT = "format"
+
+RECORD_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(
+            ATTR_DURATION, default=TRACE_DEFAULT_DURATION
+        ): cv.positive_time_period,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(
+            ATTR_DURATION, default=PROFILE_DEFAULT_DURATION
+        ): cv.positive_time_period,
+    }
+)
+
+EXPORT_TELEMETRY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In(FORMATS),
+    }
+)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, call: ServiceCall
+) -> EchoRoboticsDataUpdateCoordinator:
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    if coordinator is None:
+        raise ServiceValidationError(f"config entry {entry_id} is not loaded")
+    return coordinator
+
+
+def _get_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[EchoRoboticsDataUpdateCoordinator]:
+    """The given config entry's coordinator, or those of all loaded entries"""
+    if ATTR_CONFIG_ENTRY_ID in call.data:
+        return [_get_coordinator(hass, call)]
+    coordinators = list(hass.data.get(DOMAIN, {}).values())
+    if not coordinators:
+        raise ServiceValidationError("no config entry is loaded")
+    return coordinators
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    async def record_trace(call: ServiceCall) -> None:
+        """Write all api responses of a config entry to a trace file, for replay.py"""
+        coordinator = _get_coordinator(hass, call)
+        api = coordinator.api
+        if api.trace_recorder is not None:
+            raise ServiceValidationError(
+                f"already recording to {api.trace_recorder.path}"
+            )
+        duration: timedelta = call.data[ATTR_DURATION]
+        path = hass.config.path(
+            f"echorobotics_trace_{'_'.join(api.robot_ids)}_{int(time.time())}.jsonl.gz"
+        )
+        recorder = api.trace_recorder = TraceRecorder(hass, path, api.robot_ids)
+        _LOGGER.info("recording trace to %s for %s", path, duration)
+
+        async def stop_recording(_now) -> None:
+            if api.trace_recorder is recorder:
+                api.trace_recorder = None
+            await recorder.async_flush()
+            _LOGGER.info("recorded %s exchanges to %s", recorder.count, path)
+
+        async_call_later(hass, duration, stop_recording)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_RECORD_TRACE, record_trace, schema=RECORD_TRACE_SCHEMA
+    )
+
+    async def profile(call: ServiceCall) -> None:
+        """Profile refreshes and entity updates, of one or all config entries"""
+        coordinators = _get_coordinators(hass, call)
+        if any(c.profiler is not None for c in coordinators):
+            raise ServiceValidationError("already profiling")
+        duration: timedelta = call.data[ATTR_DURATION]
+        path = hass.config.path(f"echorobotics_profile_{int(time.time())}.prof")
+        profiler = IntegrationProfiler()
+        parse_time = sum(c.api.parse_stats.executor_time for c in coordinators)
+        for coordinator in coordinators:
+            coordinator.profiler = profiler
+        _LOGGER.info("profiling %s config entries for %s", len(coordinators), duration)
+
+        async def stop_profiling(_now) -> None:
+            profiler.active = False
+            for coordinator in coordinators:
+                if coordinator.profiler is profiler:
+                    coordinator.profiler = None
+            await hass.async_add_executor_job(profiler.profile.dump_stats, path)
+            _LOGGER.info(
+                "wrote profile to %s, parsing in the executor took another %.3fs",
+                path,
+                sum(c.api.parse_stats.executor_time for c in coordinators) - parse_time,
+            )
+
+        async_call_later(hass, duration, stop_profiling)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, profile, schema=PROFILE_SCHEMA
+    )
+
+    async def export_telemetry(call: ServiceCall) -> None:
+        """Write the telemetry kept by coordinators to a file in the config dir"""
+        coordinators = _get_coordinators(hass, call)
+        file_format = call.data[ATTR_FORMAT]
+        if file_format == FORMAT_PARQUET and not parquet_available():
+            raise ServiceValidationError("exporting to parquet needs pyarrow")
+        path = hass.config.path(
+            f"echorobotics_telemetry_{int(time.time())}.{file_format}"
+        )
+        # deques must not be iterated in the executor, while refreshes append to them
+        snapshots = [c.telemetry.snapshot() for c in coordinators]
+        samples = chain.from_iterable(snapshots)
+        writer = write_parquet if file_format == FORMAT_PARQUET else write_csv
+        rows = await hass.async_add_executor_job(writer, path, samples)
+        _LOGGER.info("exported %s telemetry samples to %s", rows, path)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TELEMETRY,
+        export_telemetry,
+        schema=EXPORT_TELEMETRY_SCHEMA,
+    )
@@ -0,0 +1,111 @@
+"""What the raw statuses and modes of the api mean, in one place
+
+The coordinator looks up a StatusRecord once per robot and update,
+entities and the fleet just read its attributes.
+Statuses the table doesn't know get a record as well, reported as unknown,
+so nothing has to handle new statuses of the api specially.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import echoroboticsapi
+
+from homeassistant.components.lawn_mower import LawnMowerActivity
+
+
+@dataclass(frozen=True, slots=True)
+class StatusRecord:
+    status: str
+    """as reported by the api"""
+    normalized: str
+    """state of the state sensor, and translation key"""
+    activity: LawnMowerActivity
+    is_error: bool
+    """an alarm, see EchoRoboticsDataUpdateCoordinator._update_alarms"""
+    is_working: bool
+    """the robot should be moving, see stuck.py"""
+
+
+def _record(
+    status: str,
+    normalized: str,
+    activity: LawnMowerActivity,
+    is_error: bool = False,
+    is_working: bool = False,
+) -> tuple[str, StatusRecord]:
+    return status, StatusRecord(status, normalized, activity, is_error, is_working)
+
+
+STATUS_TABLE: dict[str, StatusRecord] = dict(
+    [
+        _record("Offline", "offline", LawnMowerActivity.ERROR),
+        _record("Alarm", "alarm", LawnMowerActivity.ERROR, is_error=True),
+        _record("Idle", "idle", LawnMowerActivity.DOCKED),
+        _record("WaitStation", "wait_station", LawnMowerActivity.DOCKED),
+        _record("Charge", "charge", LawnMowerActivity.DOCKED),
+        _record("GoUnloadStation", "go_unload_station", LawnMowerActivity.MOWING),
+        _record("GoChargeStation", "go_charge_station", LawnMowerActivity.MOWING),
+        _record("Work", "work", LawnMowerActivity.MOWING, is_working=True),
+        _record("LeaveStation", "leave_station", LawnMowerActivity.MOWING),
+        _record("Off", "off", LawnMowerActivity.DOCKED),
+        _record("GoStation", "go_station", LawnMowerActivity.MOWING),
+        _record("Unknown", "unknown", LawnMowerActivity.ERROR),
+        _record("Warning", "warning", LawnMowerActivity.ERROR, is_error=True),
+        _record("Border", "border", LawnMowerActivity.MOWING, is_working=True),
+        _record(
+            "BorderCheck", "border_check", LawnMowerActivity.MOWING, is_working=True
+        ),
+        _record(
+            "BorderDiscovery",
+            "border_discovery",
+            LawnMowerActivity.MOWING,
+            is_working=True,
+        ),
+        _record(
+            "OffAfterAlarm", "off_after_alarm", LawnMowerActivity.ERROR, is_error=True
+        ),
+    ]
+)
+
+STATUS_OPTIONS: list[str] = list(
+    dict.fromkeys(record.normalized for record in STATUS_TABLE.values())
+)
+"""options of the state sensor"""
+
+_unknown_statuses: dict[str, StatusRecord] = {}
+
+
+def status_record(status: str) -> StatusRecord:
+    """The record of status, for statuses not in STATUS_TABLE that of "Unknown" """
+    record = STATUS_TABLE.get(status)
+    if record is not None:
+        return record
+    record = _unknown_statuses.get(status)
+    if record is None:
+        unknown = STATUS_TABLE["Unknown"]
+        record = _unknown_statuses[status] = StatusRecord(
+            status,
+            unknown.normalized,
+            unknown.activity,
+            unknown.is_error,
+            unknown.is_working,
+        )
+    return record
+
+
+@dataclass(frozen=True, slots=True)
+class ModeRecord:
+    mode: echoroboticsapi.Mode
+    auto_mow: bool
+    """whether the auto mow switch is on"""
+    activity: LawnMowerActivity
+    """lawn mower activity while changing to this mode"""
+
+
+MODE_TABLE: dict[str, ModeRecord] = {
+    "work": ModeRecord("work", True, LawnMowerActivity.MOWING),
+    "chargeAndWork": ModeRecord("chargeAndWork", True, LawnMowerActivity.DOCKED),
+    "chargeAndStay": ModeRecord("chargeAndStay", False, LawnMowerActivity.DOCKED),
+}
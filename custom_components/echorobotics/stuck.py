@@ -0,0 +1,95 @@
+"""Detect robots that report working, but don't move
+
+Fed with every StatusInfo the coordinator receives, no extra api calls.
+Each new position fix updates an exponentially weighted mean and variance of the
+position, with STUCK_WINDOW as time constant, so the state per robot is O(1).
+Positions are converted to meters around the first fix (equirectangular).
+
+A robot is stuck once it has been working for STUCK_WINDOW,
+with at least STUCK_MIN_FIXES fixes, and the spread (standard deviation)
+of its positions stayed below STUCK_MAX_SPREAD meters.
+"""
+
+from __future__ import annotations
+
+import math
+
+import echoroboticsapi
+
+from .const import STUCK_WINDOW, STUCK_MAX_SPREAD, STUCK_MIN_FIXES
+
+EARTH_RADIUS = 6371000
+"""meters"""
+
+
+class StuckDetector:
+    def __init__(self) -> None:
+        self._ref_latitude: float | None = None
+        self._ref_longitude: float = 0
+        self._cos_ref_latitude: float = 1
+        self._last_fix: float | None = None
+        """unix time of the last position fix used"""
+        self._working_since: float | None = None
+        """unix time of the first fix while working"""
+        self.fixes: int = 0
+        """fixes since working_since"""
+        self._mean_x: float = 0
+        self._mean_y: float = 0
+        self._variance: float = 0
+        """sum of the variances in x and y"""
+        self.stuck: bool = False
+
+    @property
+    def spread(self) -> float | None:
+        """Standard deviation of recent positions while working, in meters"""
+        if self._working_since is None:
+            return None
+        return math.sqrt(self._variance)
+
+    def _to_meters(self, latitude: float, longitude: float) -> tuple[float, float]:
+        if self._ref_latitude is None:
+            self._ref_latitude = latitude
+            self._cos_ref_latitude = math.cos(math.radians(latitude))
+            self._ref_longitude = longitude
+        x = math.radians(longitude - self._ref_longitude) * self._cos_ref_latitude
+        y = math.radians(latitude - self._ref_latitude)
+        return x * EARTH_RADIUS, y * EARTH_RADIUS
+
+    def update(self, si: echoroboticsapi.StatusInfo, is_working: bool) -> bool:
+        """Feed a StatusInfo, return whether stuck changed
+
+        is_working tells whether the robot should be moving, see status_table.py
+        """
+        was_stuck = self.stuck
+        if not is_working:
+            self._working_since = None
+            self.stuck = False
+            return was_stuck
+
+        fix = si.position.date_time.timestamp()
+        if fix == self._last_fix:
+            return False
+        x, y = self._to_meters(si.position.latitude, si.position.longitude)
+        if self._working_since is None or self._last_fix is None:
+            self._working_since = fix
+            self.fixes = 1
+            self._mean_x, self._mean_y = x, y
+            self._variance = 0
+        else:
+            dt = max(fix - self._last_fix, 0)
+            alpha = 1 - math.exp(-dt / STUCK_WINDOW.total_seconds())
+            dx, dy = x - self._mean_x, y - self._mean_y
+            self._mean_x += alpha * dx
+            self._mean_y += alpha * dy
+            self._variance = (1 - alpha) * (
+                self._variance + alpha * (dx * dx + dy * dy)
+            )
+            self.fixes += 1
+        self._last_fix = fix
+
+        self.stuck = (
+            fix - self._working_since >= STUCK_WINDOW.total_seconds()
+            and self.fixes >= STUCK_MIN_FIXES
+            and self._variance < STUCK_MAX_SPREAD**2
+        )
+        return self.stuck != was_stuck
@@ -20,6 +20,7 @@ from homeassistant.components.switch import SwitchDeviceClass
 from . import EchoRoboticsDataUpdateCoordinator
 from .const import DOMAIN, RobotId
 from .base import EchoRoboticsBaseEntity
+from .status_table import MODE_TABLE
 
 
 async def async_setup_entry(
@@ -54,7 +55,8 @@ class EchoRoboticsAutoMowSwitch(EchoRoboticsBaseEntity, SwitchEntity):
         self._attr_device_class = SwitchDeviceClass.SWITCH
 
     def _mode_to_state(self, mode: echoroboticsapi.Mode | None) -> bool:
-        return mode in ["chargeAndWork", "work"]
+        record = MODE_TABLE.get(mode)
+        return record is not None and record.auto_mow
 
     @property
     def is_on(self):
@@ -69,6 +71,7 @@ class EchoRoboticsAutoMowSwitch(EchoRoboticsBaseEntity, SwitchEntity):
     def extra_state_attributes(self):
         return {
             "guessed_mode": self.coordinator.smartmode.get_robot_mode(),
+            "guessed_mode_confidence": self.coordinator.mode_timeline.confidence,
             "pending_modechange": self.pending_mode or "None",
         }
 
@@ -0,0 +1,125 @@
+"""Background tasks owned by a coordinator
+
+Refreshes scheduled after a mode change and set_mode calls used to be plain
+asyncio tasks nobody kept track of. After an unload they kept using the
+closed session, and delayed homeassistant's shutdown.
+
+CoordinatorTaskGroup keeps all of them, limits how many run at once,
+and cancels them when the coordinator shuts down. Tasks still running
+after the shutdown deadline are counted as leaked, for diagnostics.
+The counters are kept in TaskStats in hass.data, so they survive reloads
+of the config entry, which create a new coordinator and task group.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from dataclasses import asdict, dataclass
+import logging
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_TASK_STATS
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class TaskStats:
+    """Counters over all task groups of one coordinator key, see async_get_task_stats"""
+
+    spawned: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    leaked: int = 0
+    """tasks that didn't finish within the shutdown deadline"""
+
+
+@callback
+def async_get_task_stats(hass: HomeAssistant, key: str) -> TaskStats:
+    """Get the TaskStats of key, kept across reloads of its config entry"""
+    stats: dict[str, TaskStats] = hass.data.setdefault(DATA_TASK_STATS, {})
+    if key not in stats:
+        stats[key] = TaskStats()
+    return stats[key]
+
+
+class CoordinatorTaskGroup:
+    def __init__(self, name: str, max_concurrency: int, stats: TaskStats):
+        self.name = name
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self.closed = False
+        self.stats = stats
+
+    @property
+    def running(self) -> int:
+        return len(self._tasks)
+
+    async def _run(self, coro: Coroutine[Any, Any, _T], delay: float) -> _T:
+        started = False
+        try:
+            if delay:
+                # sleeping doesn't count towards max_concurrency
+                await asyncio.sleep(delay)
+            async with self._semaphore:
+                started = True
+                return await coro
+        finally:
+            if not started:
+                # cancelled before coro ran, avoid "never awaited" warnings
+                coro.close()
+
+    def spawn(
+        self, coro: Coroutine[Any, Any, _T], delay: float = 0
+    ) -> asyncio.Task[_T]:
+        """Run coro in a task owned by this group, after delay seconds
+
+        Awaiting the returned task gives coro's result.
+        Exceptions of tasks nobody awaits are logged.
+        """
+        if self.closed:
+            coro.close()
+            raise RuntimeError(f"{self.name} is shut down")
+        task = asyncio.create_task(self._run(coro, delay))
+        self.stats.spawned += 1
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            self.stats.cancelled += 1
+        elif (exception := task.exception()) is not None:
+            self.stats.failed += 1
+            _LOGGER.debug("%s: background task failed", self.name, exc_info=exception)
+
+    async def async_shutdown(self, deadline: float) -> None:
+        """Cancel all tasks, wait up to deadline seconds for them to finish"""
+        self.closed = True
+        if not self._tasks:
+            return
+        tasks = set(self._tasks)
+        for task in tasks:
+            task.cancel()
+        _done, pending = await asyncio.wait(tasks, timeout=deadline)
+        if pending:
+            self.stats.leaked += len(pending)
+            _LOGGER.warning(
+                "%s: %s background tasks didn't stop within %ss",
+                self.name,
+                len(pending),
+                deadline,
+            )
+
+    def as_dict(self) -> dict:
+        return {
+            "running": self.running,
+            "closed": self.closed,
+            **asdict(self.stats),
+        }
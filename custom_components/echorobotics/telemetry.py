@@ -0,0 +1,129 @@
+"""Recent telemetry of the robots, kept by the coordinators for the export_telemetry service
+
+Every refresh adds a TelemetrySample for each robot whose data changed,
+into a deque of at most TELEMETRY_MAX_SAMPLES per coordinator.
+Exporting streams the samples in chunks of TELEMETRY_CHUNK_ROWS to CSV or Parquet,
+so only one chunk is converted at a time. The recorder is not involved.
+
+Parquet needs pyarrow, which is not a requirement of this integration.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+import csv
+from datetime import datetime, timezone
+import importlib.util
+from itertools import islice
+from typing import NamedTuple
+
+import echoroboticsapi
+
+from .const import RobotId, TELEMETRY_MAX_SAMPLES, TELEMETRY_CHUNK_ROWS
+
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+FORMATS = [FORMAT_CSV, FORMAT_PARQUET]
+
+
+class TelemetrySample(NamedTuple):
+    tstamp: float
+    """unix time the robot reported the status"""
+    robot_id: RobotId
+    status: str
+    battery: float
+    latitude: float
+    longitude: float
+    mode: echoroboticsapi.Mode | None
+    """as guessed by SmartMode"""
+
+
+class TelemetryHistory:
+    def __init__(self, max_samples: int = TELEMETRY_MAX_SAMPLES):
+        self._samples: deque[TelemetrySample] = deque(maxlen=max_samples)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def append(
+        self, si: echoroboticsapi.StatusInfo, mode: echoroboticsapi.Mode | None
+    ) -> None:
+        self._samples.append(
+            TelemetrySample(
+                si.date.timestamp(),
+                si.robot,
+                si.status,
+                si.estimated_battery_level,
+                si.position.latitude,
+                si.position.longitude,
+                mode,
+            )
+        )
+
+    def snapshot(self) -> tuple[TelemetrySample, ...]:
+        """Samples as of now, safe to export in another thread"""
+        return tuple(self._samples)
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _chunks(
+    samples: Iterable[TelemetrySample], size: int = TELEMETRY_CHUNK_ROWS
+) -> Iterator[list[TelemetrySample]]:
+    it = iter(samples)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _csv_rows(chunk: list[TelemetrySample]) -> Iterator[tuple]:
+    for sample in chunk:
+        yield (
+            datetime.fromtimestamp(sample.tstamp, timezone.utc).isoformat(),
+            *sample[1:],
+        )
+
+
+def write_csv(path: str, samples: Iterable[TelemetrySample]) -> int:
+    """Write samples to a csv file, return the number of rows"""
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(TelemetrySample._fields)
+        for chunk in _chunks(samples):
+            writer.writerows(_csv_rows(chunk))
+            rows += len(chunk)
+    return rows
+
+
+def write_parquet(path: str, samples: Iterable[TelemetrySample]) -> int:
+    """Write samples to a parquet file, one row group per chunk"""
+    # pylint: disable-next=import-outside-toplevel
+    import pyarrow as pa
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    schema = pa.schema(
+        [
+            ("tstamp", pa.timestamp("ms", tz="UTC")),
+            ("robot_id", pa.string()),
+            ("status", pa.string()),
+            ("battery", pa.float64()),
+            ("latitude", pa.float64()),
+            ("longitude", pa.float64()),
+            ("mode", pa.string()),
+        ]
+    )
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(samples):
+            columns = list(zip(*chunk))
+            columns[0] = [int(t * 1000) for t in columns[0]]
+            arrays = [
+                pa.array(column, type=field.type)
+                for column, field in zip(columns, schema)
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            rows += len(chunk)
+    return rows